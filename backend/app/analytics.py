@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.core.batching import chunked
+from app.models import (
+    AuditLog,
+    Client,
+    InvoiceStatus,
+    Lead,
+    LeadStatus,
+    LeadStatusTransition,
+    MetricCounter,
+    RevenueRollup,
+)
+
+# Forward order of the lead pipeline; `lost` is an exit, not a stage after qualified.
+LEAD_PIPELINE = (LeadStatus.new, LeadStatus.contacted, LeadStatus.qualified)
+TIME_IN_STAGE_PERCENTILES = (50, 75, 90)
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the day, ISO week (Monday) or month that contains `day`."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _empty_totals() -> dict[InvoiceStatus, dict]:
+    return {status: {"count": 0, "amount": 0.0} for status in InvoiceStatus}
+
+
+def _add(totals: dict[InvoiceStatus, dict], status: InvoiceStatus, count: int, amount: float) -> None:
+    totals[status]["count"] += int(count)
+    totals[status]["amount"] = round(totals[status]["amount"] + amount, 2)
+
+
+def revenue_report(
+    db: Session,
+    *,
+    bucket: str,
+    start: date,
+    end: date,
+    client_id: int | None = None,
+    client_limit: int = 20,
+) -> dict:
+    """Invoice totals per status, bucketed over [start, end) and per client.
+
+    Reads only the revenue rollup, whose rows are already per day, so the cost
+    depends on the number of days and clients in range, not on invoice volume.
+    Periods without invoices are omitted; clients are ranked by paid amount.
+    """
+    conditions = [RevenueRollup.day >= start, RevenueRollup.day < end]
+    if client_id is not None:
+        conditions.append(RevenueRollup.client_id == client_id)
+    count = func.sum(RevenueRollup.invoice_count)
+    amount = func.sum(RevenueRollup.amount)
+
+    periods: dict[date, dict] = {}
+    rows = db.execute(
+        select(RevenueRollup.day, RevenueRollup.status, count, amount)
+        .where(*conditions)
+        .group_by(RevenueRollup.day, RevenueRollup.status)
+        .having(count != 0)
+        .order_by(RevenueRollup.day)
+    )
+    for day, status, day_count, day_amount in rows:
+        _add(periods.setdefault(bucket_start(day, bucket), _empty_totals()), status, day_count, day_amount)
+
+    clients: dict[int, dict] = defaultdict(_empty_totals)
+    rows = db.execute(
+        select(RevenueRollup.client_id, RevenueRollup.status, count, amount)
+        .where(*conditions)
+        .group_by(RevenueRollup.client_id, RevenueRollup.status)
+        .having(count != 0)
+    )
+    for row_client_id, status, client_count, client_amount in rows:
+        _add(clients[row_client_id], status, client_count, client_amount)
+
+    ranked = sorted(clients.items(), key=lambda item: (-item[1][InvoiceStatus.paid]["amount"], item[0]))
+    ranked = ranked[:client_limit]
+    names = dict(db.execute(select(Client.id, Client.name).where(Client.id.in_([cid for cid, _ in ranked]))).all())
+
+    return {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "periods": [{"start": period, "totals": totals} for period, totals in periods.items()],
+        "clients": [
+            {"client_id": cid, "client_name": names.get(cid), "totals": totals} for cid, totals in ranked
+        ],
+    }
+
+
+def _window(start: date, end: date) -> tuple[datetime, datetime]:
+    return (
+        datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
+        datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc),
+    )
+
+
+def _advanced(from_status: LeadStatus, to_status: LeadStatus) -> bool:
+    return (
+        from_status in LEAD_PIPELINE
+        and to_status in LEAD_PIPELINE
+        and LEAD_PIPELINE.index(to_status) > LEAD_PIPELINE.index(from_status)
+    )
+
+
+def _time_in_stage(db: Session, conditions: list) -> dict[LeadStatus, dict]:
+    """Nearest-rank percentiles of the time spent in each status by leads that left it.
+
+    One pass over the window: durations are ranked per from_status with window
+    functions and each percentile picks the row at rank ceil(p * n / 100), so the
+    window is sorted once for every stage and no durations are pulled into
+    Python. Stages without recorded durations are missing from the result.
+    """
+    seconds = LeadStatusTransition.seconds_in_stage
+    ranked = (
+        select(
+            LeadStatusTransition.from_status,
+            seconds,
+            func.row_number().over(partition_by=LeadStatusTransition.from_status, order_by=seconds).label("rank"),
+            func.count().over(partition_by=LeadStatusTransition.from_status).label("samples"),
+        )
+        .where(LeadStatusTransition.from_status.is_not(None), seconds.is_not(None), *conditions)
+        .subquery()
+    )
+    # Integer ceil(p * n / 100); samples >= 1, so every rank is at least 1.
+    rows = db.execute(
+        select(
+            ranked.c.from_status,
+            func.max(ranked.c.samples),
+            *(
+                func.max(case((ranked.c.rank == (percentile * ranked.c.samples + 99) // 100, ranked.c.seconds_in_stage)))
+                for percentile in TIME_IN_STAGE_PERCENTILES
+            ),
+        ).group_by(ranked.c.from_status)
+    ).all()
+    return {
+        status: {
+            "samples": samples,
+            **{f"p{percentile}_seconds": value for percentile, value in zip(TIME_IN_STAGE_PERCENTILES, values)},
+        }
+        for status, samples, *values in rows
+    }
+
+
+def lead_funnel(db: Session, *, start: date, end: date) -> dict:
+    """Lead stage counts, conversion rates and time in stage over [start, end).
+
+    Flows come from status transitions recorded in the window: `entered` counts
+    distinct leads moving into a stage (new leads enter their initial stage),
+    `exited` counts moves out of it, and `conversion_rate` is the share of those
+    exits that advanced along the pipeline. `current` is today's active count
+    from the metric counters. Time in stage only covers leads that left the
+    stage within the window.
+    """
+    window_start, window_end = _window(start, end)
+    in_window = [LeadStatusTransition.changed_at >= window_start, LeadStatusTransition.changed_at < window_end]
+
+    entered = dict(
+        db.execute(
+            select(LeadStatusTransition.to_status, func.count(func.distinct(LeadStatusTransition.lead_id)))
+            .where(*in_window)
+            .group_by(LeadStatusTransition.to_status)
+        ).all()
+    )
+    created = db.scalar(
+        select(func.count())
+        .select_from(LeadStatusTransition)
+        .where(LeadStatusTransition.from_status.is_(None), *in_window)
+    )
+    transitions = db.execute(
+        select(LeadStatusTransition.from_status, LeadStatusTransition.to_status, func.count())
+        .where(LeadStatusTransition.from_status.is_not(None), *in_window)
+        .group_by(LeadStatusTransition.from_status, LeadStatusTransition.to_status)
+        .order_by(LeadStatusTransition.from_status, LeadStatusTransition.to_status)
+    ).all()
+
+    keys = [metrics.lead_status_key(status) for status in LeadStatus]
+    counters = dict(db.execute(select(MetricCounter.key, MetricCounter.value).where(MetricCounter.key.in_(keys))).all())
+
+    time_in_stage = _time_in_stage(db, in_window)
+
+    stages = []
+    for status in LeadStatus:
+        exits = [(to_status, count) for from_status, to_status, count in transitions if from_status == status]
+        exited = sum(count for _, count in exits)
+        advanced = sum(count for to_status, count in exits if _advanced(status, to_status))
+        stages.append(
+            {
+                "status": status,
+                "current": int(counters.get(metrics.lead_status_key(status), 0)),
+                "entered": int(entered.get(status, 0)),
+                "exited": exited,
+                "advanced": advanced,
+                "lost": sum(count for to_status, count in exits if to_status == LeadStatus.lost),
+                "conversion_rate": round(advanced / exited, 4) if exited else None,
+                "time_in_stage": time_in_stage.get(status),
+            }
+        )
+
+    return {
+        "start": start,
+        "end": end,
+        "created": int(created or 0),
+        "stages": stages,
+        "transitions": [
+            {"from_status": from_status, "to_status": to_status, "count": count}
+            for from_status, to_status, count in transitions
+        ],
+    }
+
+
+def _parse_status_change(summary: str | None) -> tuple[LeadStatus, LeadStatus] | None:
+    # Audit summaries end in "<from> → <to>"; lead names may contain anything before that.
+    parts = (summary or "").rsplit(" ", 3)
+    if len(parts) != 4 or parts[2] != "→":
+        return None
+    try:
+        return LeadStatus(parts[1]), LeadStatus(parts[3])
+    except ValueError:
+        return None
+
+
+def backfill_lead_transitions(db: Session) -> int:
+    """Seed lead_status_transitions from the audit log, once, for leads created before it existed.
+
+    Every lead gets its creation row, followed by one row per audited status
+    change. Returns the number of rows written; does nothing if the table
+    already has rows.
+    """
+    if db.scalar(select(LeadStatusTransition.id).limit(1)) is not None:
+        return 0
+
+    changes: dict[int, list[tuple[datetime, LeadStatus, LeadStatus]]] = defaultdict(list)
+    audit_rows = db.execute(
+        select(AuditLog.entity_id, AuditLog.created_at, AuditLog.summary)
+        .where(AuditLog.entity_type == "lead", AuditLog.action == "status_change")
+        .order_by(AuditLog.entity_id, AuditLog.created_at, AuditLog.id)
+    )
+    for lead_id, created_at, summary in audit_rows:
+        parsed = _parse_status_change(summary)
+        if parsed is not None:
+            changes[lead_id].append((metrics.as_utc(created_at), *parsed))
+
+    rows = []
+    for lead_id, status, created_at in db.execute(select(Lead.id, Lead.status, Lead.created_at)):
+        since = metrics.as_utc(created_at)
+        lead_changes = changes.get(lead_id, [])
+        initial = lead_changes[0][1] if lead_changes else status
+        rows.append(
+            {
+                "lead_id": lead_id,
+                "from_status": None,
+                "to_status": initial,
+                "changed_at": since,
+                "seconds_in_stage": None,
+            }
+        )
+        for changed_at, from_status, to_status in lead_changes:
+            rows.append(
+                {
+                    "lead_id": lead_id,
+                    "from_status": from_status,
+                    "to_status": to_status,
+                    "changed_at": changed_at,
+                    "seconds_in_stage": max((changed_at - since).total_seconds(), 0.0),
+                }
+            )
+            since = changed_at
+
+    for chunk in chunked(rows):
+        db.execute(insert(LeadStatusTransition), list(chunk))
+    db.commit()
+    return len(rows)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app import crud, metrics, migrations
+from app.core.config import get_settings
+from app.core.database import SessionLocal, engine
+from app.indexes import missing_indexes
+from app.seed import seed_if_empty
+
+
+def _migrate(_args: argparse.Namespace) -> int:
+    applied = migrations.upgrade(engine)
+    if applied:
+        print(f"Applied migrations: {', '.join(map(str, applied))}")
+    print(f"Schema is at version {migrations.current_version(engine)}.")
+    return 0
+
+
+def _seed(_args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        seed_if_empty(db)
+    finally:
+        db.close()
+    print("Seed data is in place.")
+    return 0
+
+
+def _setup(args: argparse.Namespace) -> int:
+    return _migrate(args) or _seed(args)
+
+
+def _backfill_revenue(_args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        rows = metrics.rebuild_revenue_rollup(db)
+    finally:
+        db.close()
+    print(f"Revenue rollup rebuilt: {rows} rows.")
+    return 0
+
+
+def _compact_audit_logs(_args: argparse.Namespace) -> int:
+    days = get_settings().audit_log_retention_days
+    before = datetime.now(timezone.utc) - timedelta(days=days)
+    db = SessionLocal()
+    try:
+        moved = crud.compact_audit_logs(db, before=before)
+    finally:
+        db.close()
+    print(f"Archived {moved} audit rows older than {days} days.")
+    return 0
+
+
+def _status(_args: argparse.Namespace) -> int:
+    print(f"Schema version: {migrations.current_version(engine)} (head {migrations.head_version()})")
+    for version, name in migrations.pending(engine):
+        print(f"  pending {version}: {name}")
+    with engine.connect() as conn:
+        missing = missing_indexes(conn)
+    for index in missing:
+        print(f"  missing index {index.name} on {index.table.name}")
+    return 1 if missing or migrations.pending(engine) else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="ClientOps Hub maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text, func in (
+        ("migrate", "Apply pending schema migrations.", _migrate),
+        ("seed", "Insert the demo users and records into an empty database.", _seed),
+        ("setup", "Run migrate, then seed; do this before starting workers in fast mode.", _setup),
+        ("status", "Show the schema version, pending migrations and missing indexes.", _status),
+        ("backfill-revenue", "Recompute the revenue rollup from the invoices table.", _backfill_revenue),
+        (
+            "compact-audit-logs",
+            "Move audit rows past AUDIT_LOG_RETENTION_DAYS to the archive table.",
+            _compact_audit_logs,
+        ),
+    ):
+        commands.add_parser(name, help=help_text).set_defaults(func=func)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Keeps `IN (...)` lists well below SQLite's bound-parameter limit.
+CHUNK_SIZE = 500
+
+
+def chunked(items: Sequence[T], size: int = CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def unique(items: Sequence[T]) -> list[T]:
+    """Drop duplicates while keeping the first-seen order."""
+    return list(dict.fromkeys(items))
@@ -16,8 +16,65 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
 
     database_url: str = "sqlite:///./clientops.db"
+
+    # Connection pool (ignored for in-memory SQLite, which uses a single connection).
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # Applied to every new SQLite connection. WAL lets readers proceed while a
+    # write is in progress; busy_timeout makes writers wait instead of failing
+    # with "database is locked".
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268435456
+    # "full": workers apply pending migrations and seed an empty database when
+    # they start. "fast": workers only check the schema version and refuse to
+    # start on an outdated database; run `python -m app.cli setup` beforehand.
+    startup_mode: str = "full"
+
     cors_origins: str = "http://localhost:5173,http://localhost:5174"
 
+    # Paginated list totals are cached per filter shape for this many seconds
+    # (0 disables). Writes through crud drop the affected entries immediately.
+    count_cache_ttl_seconds: float = 5.0
+    count_cache_max_entries: int = 1024
+    # Serialized list responses, keyed by the collection's change counter, role
+    # and query string. "memory" keeps a per-worker LRU, "redis" shares entries
+    # between workers (needs the redis package), "none" disables it.
+    response_cache_backend: str = "memory"
+    response_cache_ttl_seconds: float = 30.0
+    response_cache_max_entries: int = 512
+    response_cache_redis_url: str = "redis://localhost:6379/0"
+    # "orjson" renders responses and cached list bodies with orjson (needs the
+    # orjson package); "standard" uses FastAPI's and pydantic's encoders.
+    json_backend: str = "standard"
+
+    # `python -m app.cli compact-audit-logs` moves audit rows older than this many
+    # days to audit_logs_archive, keeping the live table to the recent window.
+    audit_log_retention_days: int = 365
+
+    # "auto" uses SQLite FTS5 when available and plain LIKE matching otherwise.
+    client_search_backend: str = "auto"
+
+    # Authenticated users are cached per username for this many seconds (0 disables).
+    user_cache_ttl_seconds: float = 60.0
+    user_cache_max_entries: int = 1024
+    # When enabled, read-only routes authorize from the token's role claim without
+    # loading the user. Role changes then only apply once existing tokens expire.
+    trust_token_role_for_reads: bool = False
+
+    # bcrypt cost for new hashes; existing hashes are upgraded on the next login.
+    bcrypt_rounds: int = 12
+    # Login verification runs on a dedicated pool of this many threads. Requests
+    # beyond password_hash_max_pending (queued + running) are rejected with 503.
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
     @property
     def cors_origins_list(self) -> list[str]:
         origins = [o.strip() for o in self.cors_origins.split(",") if o.strip()]
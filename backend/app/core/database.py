@@ -1,31 +1,151 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import AsyncAdaptedQueuePool, QueuePool, create_engine, event
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import get_settings
 
+# Async drivers and the sync driver used for the same database. Startup DDL,
+# seeding and the write routes always go through the sync engine.
+ASYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+}
+
+T = TypeVar("T")
+
 
 class Base(DeclarativeBase):
     pass
 
 
-def _build_engine():
-    settings = get_settings()
-    database_url = settings.database_url
+def _resolve_database_url() -> str:
+    database_url = get_settings().database_url
 
-    if database_url.startswith("sqlite:///./"):
-        relative_path = database_url.replace("sqlite:///./", "", 1)
+    scheme, sep, rest = database_url.partition(":///./")
+    if sep and scheme.startswith("sqlite"):
         backend_dir = Path(__file__).resolve().parents[2]
-        database_url = f"sqlite:///{(backend_dir / relative_path).resolve()}"
+        database_url = f"{scheme}:///{(backend_dir / rest).resolve()}"
+
+    return database_url
+
+
+def is_async_url(database_url: str) -> bool:
+    return database_url.split("://", 1)[0] in ASYNC_DRIVERS
+
+
+def _sync_url(database_url: str) -> str:
+    scheme, sep, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    return database_url.startswith("sqlite") and (":memory:" in database_url or database_url.endswith("://"))
+
+
+def _engine_kwargs(database_url: str, *, is_async: bool = False) -> dict:
+    settings = get_settings()
+    kwargs: dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
 
-    connect_args = {}
     if database_url.startswith("sqlite"):
-        connect_args = {"check_same_thread": False}
-    return create_engine(database_url, connect_args=connect_args)
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_sqlite(database_url):
+        kwargs.update(
+            poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+        )
+    return kwargs
+
+
+def _apply_sqlite_pragmas(sync_engine) -> None:
+    settings = get_settings()
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA cache_size = -{int(settings.sqlite_cache_size_kib)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size_bytes)}",
+    ]
+    if not _is_memory_sqlite(str(sync_engine.url)):
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _build_engine():
+    database_url = _sync_url(_resolve_database_url())
+    engine = create_engine(database_url, **_engine_kwargs(database_url))
+    if engine.dialect.name == "sqlite":
+        _apply_sqlite_pragmas(engine)
+    return engine
+
+
+def _build_async_engine():
+    database_url = _resolve_database_url()
+    if not is_async_url(database_url):
+        return None
+
+    # Imported lazily so the async extras (greenlet plus the async driver) are
+    # only required when an async database_url is configured.
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(database_url, **_engine_kwargs(database_url, is_async=True))
+    if engine.dialect.name == "sqlite":
+        _apply_sqlite_pragmas(engine.sync_engine)
+    return engine
+
+
+def _build_async_sessionmaker(bind):
+    if bind is None:
+        return None
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
 
 
 engine = _build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = _build_async_engine()
+AsyncSessionLocal = _build_async_sessionmaker(async_engine)
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        stats[name] = method() if callable(method) else None
+    return stats
+
+
+class SessionRunner:
+    """Lets async routes call the sync crud functions with the request's session.
+
+    With an async database_url the call runs on the AsyncSession's connection via
+    run_sync and never touches the threadpool; otherwise it is dispatched to the
+    threadpool with a regular Session, exactly like a sync route would be.
+    """
+
+    def __init__(self, session: Any) -> None:
+        self.session = session
+
+    async def __call__(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if isinstance(self.session, Session):
+            return await run_in_threadpool(fn, self.session, *args, **kwargs)
+        return await self.session.run_sync(fn, *args, **kwargs)
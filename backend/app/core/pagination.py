@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import base64
+import json
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int | None:
+    """Return the id the next page starts after, or None for an empty (first page) cursor.
+
+    Raises ValueError when the cursor was not produced by encode_cursor.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor.")
+    return last_id
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+
+
+def parse_fields(raw: str | None, allowed: Collection[str]) -> tuple[str, ...] | None:
+    """Parse a comma-separated `fields=` value, or return None when none was given.
+
+    Raises ValueError naming the fields that are not in `allowed`.
+    """
+    if raw is None or not raw.strip():
+        return None
+
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    return fields
@@ -1,21 +1,119 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+@lru_cache
+def get_pwd_context():
+    """The bcrypt CryptContext, built on first use so workers don't pay for it at import."""
+    from passlib.context import CryptContext
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=get_settings().bcrypt_rounds)
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when the password hashing pool already has its maximum of pending jobs."""
+
+
+class PasswordHasherPool:
+    """Runs bcrypt verification on a dedicated, bounded thread pool.
+
+    Keeps login bursts from occupying the threads that serve every other sync
+    route, and sheds load once too many verifications are waiting.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """Verify a password; the second item is a replacement hash when the stored one is outdated."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHashingBusyError("Password hashing queue is full.")
+            self._pending += 1
 
+        submitted_at = time.monotonic()
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+        def job() -> tuple[bool, str | None]:
+            waited = time.monotonic() - submitted_at
+            with self._lock:
+                self._running += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return get_pwd_context().verify_and_update(plain_password, hashed_password)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            verified, new_hash = await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+        if verified and new_hash is not None:
+            with self._lock:
+                self._rehashed += 1
+        return verified, new_hash
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+                "avg_wait_ms": round(self._total_wait / self._completed * 1000, 2) if self._completed else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasherPool(
+    workers=get_settings().password_hash_workers,
+    max_pending=get_settings().password_hash_max_pending,
+)
+
+
+def hash_password(password: str) -> str:
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(*, subject: str, role: str, expires_delta: timedelta | None = None) -> str:
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.config import get_settings
+
+_any_adapter = TypeAdapter(Any)
+
+
+@lru_cache
+def _encoder() -> Callable[[Any], bytes]:
+    if get_settings().json_backend == "orjson":
+        # Imported lazily so orjson is only required when it is configured.
+        import orjson
+
+        # OPT_UTC_Z writes UTC offsets as "Z", matching pydantic's output.
+        return lambda value: orjson.dumps(value, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return _any_adapter.dump_json
+
+
+def dump_json(value: Any) -> bytes:
+    """Encode plain data (dicts, lists, enums, datetimes) without model validation.
+
+    Both backends produce the same JSON as the response models for the rows that
+    crud's list reads return.
+    """
+    return _encoder()(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """Renders already-serialized response content with the configured JSON backend."""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def default_response_class() -> type[JSONResponse]:
+    return FastJSONResponse if get_settings().json_backend == "orjson" else JSONResponse
@@ -1,27 +1,136 @@
 from __future__ import annotations
 
+import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import String, and_, delete, func, insert, literal, or_, select, update
 from sqlalchemy.orm import Session, selectinload
 
+from app import metrics
+from app.core.batching import CHUNK_SIZE, chunked, unique
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.core.security import hash_password
-from app.models import AuditLog, Client, Invoice, InvoiceStatus, Lead, User, UserRole
+from app.models import (
+    AuditLog,
+    AuditLogArchive,
+    Client,
+    Invoice,
+    InvoiceStatus,
+    Lead,
+    LeadStatus,
+    LeadStatusTransition,
+    User,
+    UserRole,
+)
+from app.response_cache import get_response_cache
+from app.search import get_client_search
+
+
+_count_cache = TTLCache(
+    maxsize=get_settings().count_cache_max_entries,
+    ttl=get_settings().count_cache_ttl_seconds,
+)
+
+
+def _normalize_q(q: str | None) -> str:
+    return (q or "").strip().lower()
+
+
+def _cached_count(db: Session, key: tuple, count_stmt) -> int:
+    total = _count_cache.get(key)
+    if total is None:
+        total = int(db.scalar(count_stmt) or 0)
+        _count_cache.set(key, total)
+    return total
+
+
+def invalidate_counts(*entity_types: str) -> None:
+    for entity_type in entity_types:
+        _count_cache.invalidate_prefix((entity_type,))
+
+
+_user_cache = TTLCache(
+    maxsize=get_settings().user_cache_max_entries,
+    ttl=get_settings().user_cache_ttl_seconds,
+)
 
 
 def get_user_by_username(db: Session, *, username: str) -> User | None:
     return db.scalar(select(User).where(User.username == username))
 
 
+def cached_user(username: str) -> User | None:
+    """Return the cached copy of a user without touching the database."""
+    return _user_cache.get((username,))
+
+
+def get_cached_user(db: Session, *, username: str) -> User | None:
+    """Like get_user_by_username, but served from a short-lived in-process cache.
+
+    Cached users are detached copies without the password hash, so they can be
+    shared across requests and sessions; use them for identity and role only.
+    """
+    user = cached_user(username)
+    if user is None:
+        row = get_user_by_username(db, username=username)
+        if row is None:
+            return None
+        user = User(id=row.id, username=row.username, role=row.role, created_at=row.created_at)
+        _user_cache.set((username,), user)
+    return user
+
+
+def invalidate_user(username: str) -> None:
+    _user_cache.invalidate_prefix((username,))
+
+
 def create_user(db: Session, *, username: str, password: str, role: UserRole) -> User:
     user = User(username=username, hashed_password=hash_password(password), role=role)
     db.add(user)
     db.commit()
+    invalidate_user(username)
     db.refresh(user)
     return user
 
 
-def create_audit_log(
+def update_user_password_hash(db: Session, *, user: User, hashed_password: str) -> User:
+    user.hashed_password = hashed_password
+    db.add(user)
+    db.commit()
+    invalidate_user(user.username)
+    return user
+
+
+# Set in Session.info by the audit staging helpers; read and cleared by _commit.
+_AUDIT_ROWS_STAGED = "audit_rows_staged"
+
+
+def _commit(db: Session, *entity_types: str, keep_loaded: bool = False) -> None:
+    """Commit, bumping the change counters and dropping cached counts and list responses.
+
+    Pass every collection whose responses the write can change (client writes
+    also change invoices, which embed their client). "audit_logs" is added
+    automatically when the transaction staged audit rows, and only then. With keep_loaded the
+    session's objects are not expired, so the caller can serialize what it just
+    wrote without reloading it from the database.
+    """
+    if db.info.pop(_AUDIT_ROWS_STAGED, False) and "audit_logs" not in entity_types:
+        entity_types += ("audit_logs",)
+    metrics.bump_changes(db, *entity_types)
+    if keep_loaded:
+        expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+        try:
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
+    else:
+        db.commit()
+    invalidate_counts(*entity_types)
+    get_response_cache().invalidate(*entity_types)
+
+
+def stage_audit_log(
     db: Session,
     *,
     entity_type: str,
@@ -29,7 +138,9 @@ def create_audit_log(
     action: str,
     actor_user: User,
     summary: str | None = None,
+    changes: dict | None = None,
 ) -> AuditLog:
+    """Add an audit row to the current transaction; it is written by the caller's commit."""
     row = AuditLog(
         entity_type=entity_type,
         entity_id=entity_id,
@@ -37,39 +148,448 @@ def create_audit_log(
         actor_user_id=actor_user.id,
         actor_role=actor_user.role.value,
         summary=summary,
+        changes=changes,
     )
     db.add(row)
-    db.commit()
-    db.refresh(row)
+    db.info[_AUDIT_ROWS_STAGED] = True
     return row
 
 
-def list_audit_logs(db: Session) -> list[AuditLog]:
-    stmt = select(AuditLog).order_by(AuditLog.created_at.desc())
-    return list(db.scalars(stmt).all())
+def stage_audit_logs(
+    db: Session,
+    *,
+    entity_type: str,
+    action: str,
+    actor_user: User,
+    entries: list[tuple[int, str | None]],
+    changes: dict[int, dict] | None = None,
+) -> None:
+    """Bulk form of stage_audit_log: one executemany INSERT for (entity_id, summary) pairs.
+
+    `changes` optionally maps entity ids to their field diffs.
+    """
+    if not entries:
+        return
+    changes = changes or {}
+    db.info[_AUDIT_ROWS_STAGED] = True
+    db.execute(
+        insert(AuditLog),
+        [
+            {
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "action": action,
+                "actor_user_id": actor_user.id,
+                "actor_role": actor_user.role.value,
+                "summary": summary,
+                "changes": changes.get(entity_id),
+            }
+            for entity_id, summary in entries
+        ],
+    )
+
+
+# Fields whose before/after values update_* records in AuditLog.changes.
+CLIENT_AUDITED_FIELDS = ("name", "email", "phone", "company", "notes")
+LEAD_AUDITED_FIELDS = ("name", "email", "source", "status", "notes")
+INVOICE_AUDITED_FIELDS = ("client_id", "title", "amount", "status", "paid_at")
+
+
+def _audit_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return metrics.as_utc(value).isoformat()
+    return value
+
+
+def _snapshot(obj, fields: tuple[str, ...]) -> dict:
+    return {name: _audit_value(getattr(obj, name)) for name in fields}
 
 
-def list_audit_logs_page(db: Session, *, offset: int, limit: int) -> tuple[list[AuditLog], int]:
-    total = int(db.scalar(select(func.count()).select_from(AuditLog)) or 0)
-    stmt = select(AuditLog).order_by(AuditLog.created_at.desc()).offset(offset).limit(limit)
-    items = list(db.scalars(stmt).all())
+def _changes(before: dict, after: dict) -> dict | None:
+    """The {"field": {"before", "after"}} diff of two snapshots, or None when nothing changed."""
+    diff = {name: {"before": before[name], "after": after[name]} for name in before if before[name] != after[name]}
+    return diff or None
+
+
+def _select_in_chunks(db: Session, stmt, id_col, ids: list[int]) -> list:
+    rows = []
+    for chunk in chunked(ids):
+        rows += db.execute(stmt.where(id_col.in_(chunk))).all()
+    return rows
+
+
+def stage_lead_transitions(db: Session, *, entries: list[tuple[int, LeadStatus | None, LeadStatus]]) -> None:
+    """Add (lead_id, from_status, to_status) rows to the current transaction.
+
+    Time in the previous stage runs from the lead's last recorded transition, or
+    from its creation when it has none.
+    """
+    if not entries:
+        return
+    now = datetime.now(timezone.utc)
+    moved = unique([lead_id for lead_id, from_status, _ in entries if from_status is not None])
+    entered_at: dict[int, datetime] = {}
+    if moved:
+        entered_at.update(_select_in_chunks(db, select(Lead.id, Lead.created_at), Lead.id, moved))
+        entered_at.update(
+            _select_in_chunks(
+                db,
+                select(LeadStatusTransition.lead_id, func.max(LeadStatusTransition.changed_at)).group_by(
+                    LeadStatusTransition.lead_id
+                ),
+                LeadStatusTransition.lead_id,
+                moved,
+            )
+        )
+
+    rows = []
+    for lead_id, from_status, to_status in entries:
+        since = entered_at.get(lead_id) if from_status is not None else None
+        rows.append(
+            {
+                "lead_id": lead_id,
+                "from_status": from_status,
+                "to_status": to_status,
+                "changed_at": now,
+                "seconds_in_stage": max((now - metrics.as_utc(since)).total_seconds(), 0.0) if since else None,
+            }
+        )
+    db.execute(insert(LeadStatusTransition), rows)
+
+
+def _seek_after(model, order_col, after_id: int, *, descending: bool = True):
+    # Resolve the anchor row's sort key in SQL so the comparison always uses the
+    # stored representation (SQLite keeps DateTime values as text).
+    anchor = select(order_col).where(model.id == after_id).correlate(None).scalar_subquery()
+    if descending:
+        return or_(order_col < anchor, and_(order_col == anchor, model.id < after_id))
+    return or_(order_col > anchor, and_(order_col == anchor, model.id > after_id))
+
+
+def _stored_time(value: datetime):
+    """`value` as a bind that compares with stored DateTime text in time order.
+
+    SQLite keeps DateTime values as naive UTC text: "YYYY-MM-DD HH:MM:SS" from the
+    CURRENT_TIMESTAMP server defaults and with a ".ffffff" fraction when written
+    from Python. The bound is converted to UTC and a whole second is rendered
+    without the fraction, so it orders correctly against both forms while the
+    column itself stays bare for the indexes.
+    """
+    moment = metrics.as_utc(value).astimezone(timezone.utc).replace(tzinfo=None)
+    return literal(moment.isoformat(sep=" ", timespec="microseconds" if moment.microsecond else "seconds"), String())
+
+
+def _ordered(stmt, model, order_col, *, descending: bool = True):
+    """Order by `order_col`, breaking ties on id in the same direction."""
+    if descending:
+        return stmt.order_by(order_col.desc(), model.id.desc())
+    return stmt.order_by(order_col.asc(), model.id.asc())
+
+
+def _keyset_page(db: Session, stmt, *, model, order_col, after_id: int | None, limit: int, descending: bool = True):
+    if after_id is not None:
+        stmt = stmt.where(_seek_after(model, order_col, after_id, descending=descending))
+    rows = _rows(db, _ordered(stmt, model, order_col, descending=descending).limit(limit + 1))
+    next_id = rows[limit - 1]["id"] if len(rows) > limit else None
+    return rows[:limit], next_id
+
+
+# List reads select the columns of the list schemas (ClientRead, LeadRead,
+# InvoiceRead, AuditLogRead) in field order and return plain dicts built from the
+# row tuples, skipping ORM object construction and the identity map.
+CLIENT_LIST_COLUMNS = (
+    Client.name,
+    Client.email,
+    Client.phone,
+    Client.company,
+    Client.notes,
+    Client.id,
+    Client.created_at,
+    Client.deleted_at,
+)
+LEAD_LIST_COLUMNS = (
+    Lead.name,
+    Lead.email,
+    Lead.source,
+    Lead.status,
+    Lead.notes,
+    Lead.id,
+    Lead.created_at,
+    Lead.deleted_at,
+)
+INVOICE_LIST_COLUMNS = (
+    Invoice.client_id,
+    Invoice.title,
+    Invoice.amount,
+    Invoice.status,
+    Invoice.id,
+    Invoice.issued_at,
+    Invoice.paid_at,
+    Invoice.deleted_at,
+)
+AUDIT_LOG_LIST_COLUMNS = (
+    AuditLog.id,
+    AuditLog.entity_type,
+    AuditLog.entity_id,
+    AuditLog.action,
+    AuditLog.actor_user_id,
+    AuditLog.actor_role,
+    AuditLog.created_at,
+    AuditLog.summary,
+    AuditLog.changes,
+)
+
+# Names accepted by the list routes' `fields=` projection; invoices also take
+# "client" for the whole nested client or "client.<field>" for part of it.
+CLIENT_LIST_FIELDS = tuple(column.key for column in CLIENT_LIST_COLUMNS)
+LEAD_LIST_FIELDS = tuple(column.key for column in LEAD_LIST_COLUMNS)
+INVOICE_LIST_FIELDS = (
+    *(column.key for column in INVOICE_LIST_COLUMNS),
+    "client",
+    *(f"client.{name}" for name in CLIENT_LIST_FIELDS),
+)
+
+
+def _project(columns: tuple, fields: tuple[str, ...] | None) -> tuple:
+    """The subset of `columns` named in `fields`, always keeping id for keyset paging."""
+    if fields is None:
+        return columns
+    return tuple(column for column in columns if column.key == "id" or column.key in fields)
+
+
+def _rows(db: Session, stmt) -> list[dict]:
+    """Plain dicts from the row tuples; trailing columns labelled "<name>.<field>" nest under <name>."""
+    result = db.execute(stmt)
+    keys = tuple(result.keys())
+    split = next((index for index, key in enumerate(keys) if "." in key), len(keys))
+    if split == len(keys):
+        return [dict(zip(keys, row)) for row in result]
+
+    nested_name = keys[split].partition(".")[0]
+    nested_keys = tuple(key.partition(".")[2] for key in keys[split:])
+    return [
+        dict(zip(keys[:split], row[:split]), **{nested_name: dict(zip(nested_keys, row[split:]))})
+        for row in result
+    ]
+
+
+def _select_clients(fields: tuple[str, ...] | None = None):
+    return select(*_project(CLIENT_LIST_COLUMNS, fields))
+
+
+def _select_leads(fields: tuple[str, ...] | None = None):
+    return select(*_project(LEAD_LIST_COLUMNS, fields))
+
+
+def _select_invoices(fields: tuple[str, ...] | None = None):
+    client_columns = CLIENT_LIST_COLUMNS
+    if fields is not None and "client" not in fields:
+        client_fields = tuple(name.partition(".")[2] for name in fields if name.startswith("client."))
+        client_columns = _project(CLIENT_LIST_COLUMNS, client_fields) if client_fields else ()
+    return select(
+        *_project(INVOICE_LIST_COLUMNS, fields),
+        *(column.label(f"client.{column.key}") for column in client_columns),
+    ).join_from(Invoice, Client)
+
+
+# Filters and sort keys accepted by the lead and invoice lists, by name. Routes
+# validate the values; the list indexes in models.py cover each of them.
+_LEAD_FILTERS = {
+    "status": lambda value: Lead.status.in_(value),
+    "source": lambda value: Lead.source == value,
+    "created_from": lambda value: Lead.created_at >= _stored_time(value),
+    "created_to": lambda value: Lead.created_at < _stored_time(value),
+}
+LEAD_SORTS = {"created_at": Lead.created_at, "name": Lead.name, "status": Lead.status}
+_INVOICE_FILTERS = {
+    "status": lambda value: Invoice.status.in_(value),
+    "client_id": lambda value: Invoice.client_id == value,
+    "issued_from": lambda value: Invoice.issued_at >= _stored_time(value),
+    "issued_to": lambda value: Invoice.issued_at < _stored_time(value),
+    "amount_min": lambda value: Invoice.amount >= value,
+    "amount_max": lambda value: Invoice.amount <= value,
+}
+INVOICE_SORTS = {
+    "issued_at": Invoice.issued_at,
+    "amount": Invoice.amount,
+    "title": Invoice.title,
+    "status": Invoice.status,
+}
+
+
+def _filter_conditions(conditions: dict, filters: dict | None) -> list:
+    return [conditions[name](value) for name, value in (filters or {}).items() if value is not None]
+
+
+def _filters_key(filters: dict | None) -> tuple:
+    """A hashable, order-independent form of `filters` for the count cache."""
+    return tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in (filters or {}).items()
+            if value is not None
+        )
+    )
+
+
+def _sort_order(sorts: dict, sort: str) -> tuple:
+    """Resolve "field" or "-field" (descending) to the column and direction."""
+    return sorts[sort.removeprefix("-")], sort.startswith("-")
+
+
+def _audit_log_filters(model) -> dict:
+    return {
+        "entity_type": lambda value: model.entity_type == value,
+        "entity_id": lambda value: model.entity_id == value,
+        "action": lambda value: model.action.in_(value),
+        "actor_user_id": lambda value: model.actor_user_id == value,
+        "created_from": lambda value: model.created_at >= _stored_time(value),
+        "created_to": lambda value: model.created_at < _stored_time(value),
+    }
+
+
+# The live table and the archive are filtered the same way; see compact_audit_logs.
+_AUDIT_LOG_FILTERS = {model: _audit_log_filters(model) for model in (AuditLog, AuditLogArchive)}
+
+
+def _audit_log_model(archived: bool):
+    return AuditLogArchive if archived else AuditLog
+
+
+def _audit_logs_stmt(model, filters: dict | None):
+    columns = [getattr(model, column.key) for column in AUDIT_LOG_LIST_COLUMNS]
+    return select(*columns).where(*_filter_conditions(_AUDIT_LOG_FILTERS[model], filters))
+
+
+def list_audit_logs(db: Session, *, archived: bool = False, filters: dict | None = None) -> list[dict]:
+    model = _audit_log_model(archived)
+    return _rows(db, _ordered(_audit_logs_stmt(model, filters), model, model.created_at))
+
+
+def list_audit_logs_page(
+    db: Session,
+    *,
+    offset: int,
+    limit: int,
+    with_total: bool = True,
+    archived: bool = False,
+    filters: dict | None = None,
+) -> tuple[list[dict], int | None]:
+    model = _audit_log_model(archived)
+    total = None
+    if with_total:
+        count_stmt = select(func.count()).select_from(model)
+        count_stmt = count_stmt.where(*_filter_conditions(_AUDIT_LOG_FILTERS[model], filters))
+        total = _cached_count(db, ("audit_logs", archived, _filters_key(filters)), count_stmt)
+    stmt = _ordered(_audit_logs_stmt(model, filters), model, model.created_at).offset(offset).limit(limit)
+    items = _rows(db, stmt)
     return items, total
 
 
-def list_clients(db: Session, *, q: str | None = None) -> list[Client]:
-    stmt = select(Client).where(Client.deleted_at.is_(None)).order_by(Client.created_at.desc())
-    if q:
-        like = f"%{q.strip()}%"
-        stmt = stmt.where((Client.name.ilike(like)) | (Client.company.ilike(like)))
-    return list(db.scalars(stmt).all())
+def _audit_seek_after(model, after_id: int):
+    """Keyset condition after the audit row `after_id`, wherever it lives now.
+
+    compact_audit_logs may move the cursor's row to the archive between two
+    pages, so its created_at is looked up in both tables (ids are preserved).
+    If it is gone from both, the seek falls back to the id alone, which follows
+    insertion order.
+    """
+    anchor = func.coalesce(
+        select(AuditLog.created_at).where(AuditLog.id == after_id).scalar_subquery(),
+        select(AuditLogArchive.created_at).where(AuditLogArchive.id == after_id).scalar_subquery(),
+    )
+    return or_(
+        model.created_at < anchor,
+        and_(model.created_at == anchor, model.id < after_id),
+        and_(anchor.is_(None), model.id < after_id),
+    )
+
+
+def list_audit_logs_keyset(
+    db: Session,
+    *,
+    after_id: int | None,
+    limit: int,
+    archived: bool = False,
+    filters: dict | None = None,
+) -> tuple[list[dict], int | None]:
+    model = _audit_log_model(archived)
+    stmt = _audit_logs_stmt(model, filters)
+    if after_id is not None:
+        stmt = stmt.where(_audit_seek_after(model, after_id))
+    return _keyset_page(db, stmt, model=model, order_col=model.created_at, after_id=None, limit=limit)
+
+
+def entity_history(
+    db: Session, *, entity_type: str, entity_id: int, after_id: int | None, limit: int
+) -> tuple[list[dict], int | None]:
+    """Audit rows of one entity, newest first, from the live table and the archive.
+
+    Each table is read through its (entity_type, entity_id, created_at) index
+    with at most `limit` + 1 rows, and the two pages are merged here.
+    """
+    rows = []
+    for model in (AuditLog, AuditLogArchive):
+        stmt = _audit_logs_stmt(model, {"entity_type": entity_type, "entity_id": entity_id})
+        if after_id is not None:
+            stmt = stmt.where(_audit_seek_after(model, after_id))
+        rows += _rows(db, _ordered(stmt, model, model.created_at).limit(limit + 1))
+    rows.sort(key=lambda row: (row["created_at"], row["id"]), reverse=True)
+    next_id = rows[limit - 1]["id"] if len(rows) > limit else None
+    return rows[:limit], next_id
+
+
+def compact_audit_logs(db: Session, *, before: datetime, batch_size: int = CHUNK_SIZE) -> int:
+    """Move audit rows created before `before` into audit_logs_archive; returns how many moved.
+
+    Works oldest first in batches of `batch_size`, committing after each, so
+    writers are only ever blocked for one batch and an interrupted run can
+    simply be repeated. The newest row always stays: SQLite hands out ids
+    above the current maximum of the table, so an emptied audit_logs would
+    reissue ids that are already in the archive.
+    """
+    columns = [column.key for column in AuditLog.__table__.columns]
+    newest_id = db.scalar(select(func.max(AuditLog.id)))
+    moved = 0
+    while True:
+        ids = list(
+            db.scalars(
+                select(AuditLog.id)
+                .where(AuditLog.created_at < before, AuditLog.id != newest_id)
+                .order_by(AuditLog.created_at, AuditLog.id)
+                .limit(batch_size)
+            )
+        )
+        if not ids:
+            return moved
+        db.execute(
+            insert(AuditLogArchive).from_select(
+                columns, select(*[getattr(AuditLog, name) for name in columns]).where(AuditLog.id.in_(ids))
+            )
+        )
+        db.execute(delete(AuditLog).where(AuditLog.id.in_(ids)), execution_options={"synchronize_session": False})
+        _commit(db, "audit_logs")
+        moved += len(ids)
+
+
+def _search_clients(stmt, q: str | None, *, ranked: bool):
+    if not q or not q.strip():
+        return stmt
+    return get_client_search().apply(stmt, q, ranked=ranked)
 
 
-def list_clients_including_archived(db: Session, *, q: str | None = None) -> list[Client]:
-    stmt = select(Client).order_by(Client.created_at.desc())
-    if q:
-        like = f"%{q.strip()}%"
-        stmt = stmt.where((Client.name.ilike(like)) | (Client.company.ilike(like)))
-    return list(db.scalars(stmt).all())
+def list_clients(db: Session, *, q: str | None = None, fields: tuple[str, ...] | None = None) -> list[dict]:
+    stmt = _search_clients(_select_clients(fields).where(Client.deleted_at.is_(None)), q, ranked=True)
+    return _rows(db, stmt.order_by(Client.created_at.desc()))
+
+
+def list_clients_including_archived(
+    db: Session, *, q: str | None = None, fields: tuple[str, ...] | None = None
+) -> list[dict]:
+    stmt = _search_clients(_select_clients(fields), q, ranked=True)
+    return _rows(db, stmt.order_by(Client.created_at.desc()))
 
 
 def list_clients_page(
@@ -78,20 +598,16 @@ def list_clients_page(
     q: str | None = None,
     offset: int,
     limit: int,
-) -> tuple[list[Client], int]:
-    stmt = select(Client).where(Client.deleted_at.is_(None))
-    count_stmt = select(func.count()).select_from(Client).where(Client.deleted_at.is_(None))
-
-    if q:
-        like = f"%{q.strip()}%"
-        condition = (Client.name.ilike(like)) | (Client.company.ilike(like))
-        stmt = stmt.where(condition)
-        count_stmt = count_stmt.where(condition)
-
-    total = int(db.scalar(count_stmt) or 0)
-    items = list(
-        db.scalars(stmt.order_by(Client.created_at.desc()).offset(offset).limit(limit)).all()
+    with_total: bool = True,
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[dict], int | None]:
+    stmt = _search_clients(_select_clients(fields).where(Client.deleted_at.is_(None)), q, ranked=True)
+    count_stmt = _search_clients(
+        select(func.count()).select_from(Client).where(Client.deleted_at.is_(None)), q, ranked=False
     )
+
+    total = _cached_count(db, ("clients", False, _normalize_q(q)), count_stmt) if with_total else None
+    items = _rows(db, stmt.order_by(Client.created_at.desc()).offset(offset).limit(limit))
     return items, total
 
 
@@ -101,21 +617,34 @@ def list_clients_page_including_archived(
     q: str | None = None,
     offset: int,
     limit: int,
-) -> tuple[list[Client], int]:
-    stmt = select(Client)
-    count_stmt = select(func.count()).select_from(Client)
-
-    if q:
-        like = f"%{q.strip()}%"
-        condition = (Client.name.ilike(like)) | (Client.company.ilike(like))
-        stmt = stmt.where(condition)
-        count_stmt = count_stmt.where(condition)
-
-    total = int(db.scalar(count_stmt) or 0)
-    items = list(db.scalars(stmt.order_by(Client.created_at.desc()).offset(offset).limit(limit)).all())
+    with_total: bool = True,
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[dict], int | None]:
+    stmt = _search_clients(_select_clients(fields), q, ranked=True)
+    count_stmt = _search_clients(select(func.count()).select_from(Client), q, ranked=False)
+
+    total = _cached_count(db, ("clients", True, _normalize_q(q)), count_stmt) if with_total else None
+    items = _rows(db, stmt.order_by(Client.created_at.desc()).offset(offset).limit(limit))
     return items, total
 
 
+def list_clients_keyset(
+    db: Session,
+    *,
+    q: str | None = None,
+    include_archived: bool = False,
+    after_id: int | None,
+    limit: int,
+    fields: tuple[str, ...] | None = None,
+) -> tuple[list[dict], int | None]:
+    stmt = _select_clients(fields)
+    if not include_archived:
+        stmt = stmt.where(Client.deleted_at.is_(None))
+    # Keyset pages keep the (created_at, id) order; relevance ranking only applies to offset pages.
+    stmt = _search_clients(stmt, q, ranked=False)
+    return _keyset_page(db, stmt, model=Client, order_col=Client.created_at, after_id=after_id, limit=limit)
+
+
 def get_client(db: Session, *, client_id: int) -> Client | None:
     stmt = select(Client).where(Client.id == client_id, Client.deleted_at.is_(None))
     return db.scalar(stmt)
@@ -126,78 +655,260 @@ def get_client_including_archived(db: Session, *, client_id: int) -> Client | No
     return db.scalar(stmt)
 
 
-def create_client(db: Session, *, data: dict) -> Client:
+def create_client(db: Session, *, data: dict, actor_user: User | None = None) -> Client:
     client = Client(**data)
     db.add(client)
-    db.commit()
+    db.flush()
+    get_client_search().sync_client(db, client)
+    metrics.record(db, before={}, after=metrics.client_counters(client))
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="client",
+            entity_id=client.id,
+            action="create",
+            actor_user=actor_user,
+            summary=f"Created client: {client.name}",
+        )
+    _commit(db, "clients")
     db.refresh(client)
     return client
 
 
-def update_client(db: Session, *, client: Client, data: dict) -> Client:
+def update_client(db: Session, *, client: Client, data: dict, actor_user: User | None = None) -> Client:
+    before = _snapshot(client, CLIENT_AUDITED_FIELDS)
     for k, v in data.items():
         setattr(client, k, v)
     db.add(client)
-    db.commit()
+    get_client_search().sync_client(db, client)
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="client",
+            entity_id=client.id,
+            action="update",
+            actor_user=actor_user,
+            summary=f"Updated client: {client.name}",
+            changes=_changes(before, _snapshot(client, CLIENT_AUDITED_FIELDS)),
+        )
+    _commit(db, "clients", "invoices")
     db.refresh(client)
     return client
 
 
-def delete_client(db: Session, *, client: Client) -> None:
-    now = datetime.now(timezone.utc)
-    if client.deleted_at is None:
-        client.deleted_at = now
-        for inv in client.invoices:
-            if inv.deleted_at is None:
-                inv.deleted_at = now
-
-    db.add(client)
-    db.commit()
+def _stage_invoice_cascade_audit(db: Session, invoice_filter, *, action: str, summary_prefix: str, actor_user: User) -> None:
+    """Write one audit row per matching invoice with a single INSERT ... SELECT."""
+    columns = ["entity_type", "entity_id", "action", "actor_user_id", "actor_role", "summary"]
+    rows = select(
+        literal("invoice"),
+        Invoice.id,
+        literal(action),
+        literal(actor_user.id),
+        literal(actor_user.role.value),
+        literal(summary_prefix) + Invoice.title,
+    ).where(*invoice_filter)
+    db.execute(insert(AuditLog).from_select(columns, rows))
+    db.info[_AUDIT_ROWS_STAGED] = True
+
+
+def _set_client_trees_archived(
+    db: Session, client_ids: list[int], *, archived: bool, actor_user: User | None = None
+) -> None:
+    """Archive or restore clients and their invoices with set-based UPDATEs.
+
+    The invoices are never loaded: each id chunk costs one UPDATE per table, plus
+    one INSERT ... SELECT for the per-invoice audit rows. Client audit rows are
+    left to the caller.
+    """
+    deleted_at = datetime.now(timezone.utc) if archived else None
+    before = metrics.client_tree_counters_for(db, client_ids)
+    for chunk in chunked(client_ids):
+        invoice_filter = (
+            Invoice.client_id.in_(chunk),
+            Invoice.deleted_at.is_(None) if archived else Invoice.deleted_at.is_not(None),
+        )
+        if actor_user is not None:
+            _stage_invoice_cascade_audit(
+                db,
+                invoice_filter,
+                action="archive" if archived else "restore",
+                summary_prefix="Archived with client: " if archived else "Restored with client: ",
+                actor_user=actor_user,
+            )
+        db.execute(
+            update(Invoice).where(*invoice_filter).values(deleted_at=deleted_at),
+            execution_options={"synchronize_session": False},
+        )
+        db.execute(update(Client).where(Client.id.in_(chunk)).values(deleted_at=deleted_at))
+    metrics.record(db, before=before, after=metrics.client_tree_counters_for(db, client_ids))
 
 
-def restore_client(db: Session, *, client: Client) -> Client:
-    client.deleted_at = None
-    for inv in client.invoices:
-        inv.deleted_at = None
-    db.add(client)
-    db.commit()
+def delete_client(db: Session, *, client: Client, actor_user: User | None = None) -> None:
+    if client.deleted_at is None:
+        _set_client_trees_archived(db, [client.id], archived=True, actor_user=actor_user)
+
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="client",
+            entity_id=client.id,
+            action="archive",
+            actor_user=actor_user,
+            summary=f"Archived client: {client.name}",
+        )
+    _commit(db, "clients", "invoices")
+
+
+def restore_client(db: Session, *, client: Client, actor_user: User | None = None) -> Client:
+    _set_client_trees_archived(db, [client.id], archived=False, actor_user=actor_user)
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="client",
+            entity_id=client.id,
+            action="restore",
+            actor_user=actor_user,
+            summary=f"Restored client: {client.name}",
+        )
+    _commit(db, "clients", "invoices")
     db.refresh(client)
     return client
 
 
-def list_leads(db: Session) -> list[Lead]:
-    stmt = select(Lead).where(Lead.deleted_at.is_(None)).order_by(Lead.created_at.desc())
-    return list(db.scalars(stmt).all())
+def missing_client_ids(db: Session, *, ids: list[int]) -> list[int]:
+    """Ids from `ids` that do not belong to an active client."""
+    found = _select_in_chunks(db, select(Client.id).where(Client.deleted_at.is_(None)), Client.id, unique(ids))
+    found_ids = {row.id for row in found}
+    return [i for i in unique(ids) if i not in found_ids]
+
+
+def create_clients(db: Session, *, rows: list[dict], actor_user: User | None = None) -> list[int]:
+    """Insert many clients in one transaction and return their ids in input order."""
+    ids = list(db.scalars(insert(Client).returning(Client.id, sort_by_parameter_order=True), rows))
+    get_client_search().sync_clients(db, [{**row, "id": client_id} for client_id, row in zip(ids, rows)])
+    metrics.record(db, before={}, after=metrics.client_tree_counters_for(db, ids))
+    if actor_user is not None:
+        stage_audit_logs(
+            db,
+            entity_type="client",
+            action="create",
+            actor_user=actor_user,
+            entries=[(client_id, f"Created client: {row['name']}") for client_id, row in zip(ids, rows)],
+        )
+    _commit(db, "clients")
+    return ids
 
 
-def list_leads_including_archived(db: Session) -> list[Lead]:
-    return list(db.scalars(select(Lead).order_by(Lead.created_at.desc())).all())
+def archive_clients(db: Session, *, ids: list[int], actor_user: User | None = None) -> list[int]:
+    """Archive active clients together with their invoices; returns the archived ids."""
+    targets = _select_in_chunks(
+        db, select(Client.id, Client.name).where(Client.deleted_at.is_(None)), Client.id, unique(ids)
+    )
+    client_ids = [row.id for row in targets]
+    if client_ids:
+        _set_client_trees_archived(db, client_ids, archived=True, actor_user=actor_user)
+        if actor_user is not None:
+            stage_audit_logs(
+                db,
+                entity_type="client",
+                action="archive",
+                actor_user=actor_user,
+                entries=[(row.id, f"Archived client: {row.name}") for row in targets],
+            )
+    _commit(db, "clients", "invoices")
+    return client_ids
+
+
+def _leads_stmt(*, include_archived: bool, fields: tuple[str, ...] | None, filters: dict | None):
+    stmt = _select_leads(fields)
+    if not include_archived:
+        stmt = stmt.where(Lead.deleted_at.is_(None))
+    return stmt.where(*_filter_conditions(_LEAD_FILTERS, filters))
+
+
+def _count_leads(db: Session, *, include_archived: bool, filters: dict | None) -> int:
+    stmt = select(func.count()).select_from(Lead)
+    if not include_archived:
+        stmt = stmt.where(Lead.deleted_at.is_(None))
+    stmt = stmt.where(*_filter_conditions(_LEAD_FILTERS, filters))
+    return _cached_count(db, ("leads", include_archived, _filters_key(filters)), stmt)
+
+
+def list_leads(
+    db: Session,
+    *,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-created_at",
+) -> list[dict]:
+    order_col, descending = _sort_order(LEAD_SORTS, sort)
+    stmt = _leads_stmt(include_archived=False, fields=fields, filters=filters)
+    return _rows(db, _ordered(stmt, Lead, order_col, descending=descending))
 
 
-def list_leads_page(db: Session, *, offset: int, limit: int) -> tuple[list[Lead], int]:
-    total = int(
-        db.scalar(select(func.count()).select_from(Lead).where(Lead.deleted_at.is_(None))) or 0
-    )
-    items = list(
-        db.scalars(
-            select(Lead)
-            .where(Lead.deleted_at.is_(None))
-            .order_by(Lead.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        ).all()
-    )
+def list_leads_including_archived(
+    db: Session,
+    *,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-created_at",
+) -> list[dict]:
+    order_col, descending = _sort_order(LEAD_SORTS, sort)
+    stmt = _leads_stmt(include_archived=True, fields=fields, filters=filters)
+    return _rows(db, _ordered(stmt, Lead, order_col, descending=descending))
+
+
+def list_leads_page(
+    db: Session,
+    *,
+    offset: int,
+    limit: int,
+    with_total: bool = True,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-created_at",
+) -> tuple[list[dict], int | None]:
+    total = _count_leads(db, include_archived=False, filters=filters) if with_total else None
+    order_col, descending = _sort_order(LEAD_SORTS, sort)
+    stmt = _leads_stmt(include_archived=False, fields=fields, filters=filters)
+    items = _rows(db, _ordered(stmt, Lead, order_col, descending=descending).offset(offset).limit(limit))
     return items, total
 
 
-def list_leads_page_including_archived(db: Session, *, offset: int, limit: int) -> tuple[list[Lead], int]:
-    total = int(db.scalar(select(func.count()).select_from(Lead)) or 0)
-    items = list(
-        db.scalars(select(Lead).order_by(Lead.created_at.desc()).offset(offset).limit(limit)).all()
-    )
+def list_leads_page_including_archived(
+    db: Session,
+    *,
+    offset: int,
+    limit: int,
+    with_total: bool = True,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-created_at",
+) -> tuple[list[dict], int | None]:
+    total = _count_leads(db, include_archived=True, filters=filters) if with_total else None
+    order_col, descending = _sort_order(LEAD_SORTS, sort)
+    stmt = _leads_stmt(include_archived=True, fields=fields, filters=filters)
+    items = _rows(db, _ordered(stmt, Lead, order_col, descending=descending).offset(offset).limit(limit))
     return items, total
 
 
+def list_leads_keyset(
+    db: Session,
+    *,
+    include_archived: bool = False,
+    after_id: int | None,
+    limit: int,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-created_at",
+) -> tuple[list[dict], int | None]:
+    order_col, descending = _sort_order(LEAD_SORTS, sort)
+    stmt = _leads_stmt(include_archived=include_archived, fields=fields, filters=filters)
+    return _keyset_page(
+        db, stmt, model=Lead, order_col=order_col, after_id=after_id, limit=limit, descending=descending
+    )
+
+
 def get_lead(db: Session, *, lead_id: int) -> Lead | None:
     stmt = select(Lead).where(Lead.id == lead_id, Lead.deleted_at.is_(None))
     return db.scalar(stmt)
@@ -208,92 +919,272 @@ def get_lead_including_archived(db: Session, *, lead_id: int) -> Lead | None:
     return db.scalar(stmt)
 
 
-def create_lead(db: Session, *, data: dict) -> Lead:
+def create_lead(db: Session, *, data: dict, actor_user: User | None = None) -> Lead:
     lead = Lead(**data)
+    if lead.status is None:
+        lead.status = LeadStatus.new
     db.add(lead)
-    db.commit()
+    db.flush()
+    metrics.record(db, before={}, after=metrics.lead_counters(lead))
+    stage_lead_transitions(db, entries=[(lead.id, None, lead.status)])
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="lead",
+            entity_id=lead.id,
+            action="create",
+            actor_user=actor_user,
+            summary=f"Created lead: {lead.name}",
+        )
+    _commit(db, "leads")
     db.refresh(lead)
     return lead
 
 
-def update_lead(db: Session, *, lead: Lead, data: dict) -> Lead:
+def update_lead(db: Session, *, lead: Lead, data: dict, actor_user: User | None = None) -> Lead:
+    prev_status = lead.status
+    before = metrics.lead_counters(lead)
+    snapshot = _snapshot(lead, LEAD_AUDITED_FIELDS)
     for k, v in data.items():
         setattr(lead, k, v)
+    metrics.record(db, before=before, after=metrics.lead_counters(lead))
     db.add(lead)
-    db.commit()
+    status_changed = lead.status != prev_status
+    if status_changed:
+        stage_lead_transitions(db, entries=[(lead.id, prev_status, lead.status)])
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="lead",
+            entity_id=lead.id,
+            action="status_change" if status_changed else "update",
+            actor_user=actor_user,
+            summary=(
+                f"Lead status: {lead.name} {prev_status.value} → {lead.status.value}"
+                if status_changed
+                else f"Updated lead: {lead.name}"
+            ),
+            changes=_changes(snapshot, _snapshot(lead, LEAD_AUDITED_FIELDS)),
+        )
+    _commit(db, "leads")
     db.refresh(lead)
     return lead
 
 
-def delete_lead(db: Session, *, lead: Lead) -> None:
+def delete_lead(db: Session, *, lead: Lead, actor_user: User | None = None) -> None:
     if lead.deleted_at is None:
+        before = metrics.lead_counters(lead)
         lead.deleted_at = datetime.now(timezone.utc)
+        metrics.record(db, before=before, after=metrics.lead_counters(lead))
         db.add(lead)
-        db.commit()
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="lead",
+            entity_id=lead.id,
+            action="archive",
+            actor_user=actor_user,
+            summary=f"Archived lead: {lead.name}",
+        )
+    _commit(db, "leads")
 
 
-def restore_lead(db: Session, *, lead: Lead) -> Lead:
+def restore_lead(db: Session, *, lead: Lead, actor_user: User | None = None) -> Lead:
+    before = metrics.lead_counters(lead)
     lead.deleted_at = None
+    metrics.record(db, before=before, after=metrics.lead_counters(lead))
     db.add(lead)
-    db.commit()
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="lead",
+            entity_id=lead.id,
+            action="restore",
+            actor_user=actor_user,
+            summary=f"Restored lead: {lead.name}",
+        )
+    _commit(db, "leads")
     db.refresh(lead)
     return lead
 
 
-def list_invoices(db: Session) -> list[Invoice]:
-    stmt = (
-        select(Invoice)
-        .join(Invoice.client)
-        .where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
-        .options(selectinload(Invoice.client))
-        .order_by(Invoice.issued_at.desc())
+def missing_lead_ids(db: Session, *, ids: list[int]) -> list[int]:
+    """Ids from `ids` that do not belong to an active lead."""
+    found = _select_in_chunks(db, select(Lead.id).where(Lead.deleted_at.is_(None)), Lead.id, unique(ids))
+    found_ids = {row.id for row in found}
+    return [i for i in unique(ids) if i not in found_ids]
+
+
+def create_leads(db: Session, *, rows: list[dict], actor_user: User | None = None) -> list[int]:
+    """Insert many leads in one transaction and return their ids in input order."""
+    rows = [{**row, "status": row.get("status") or LeadStatus.new} for row in rows]
+    ids = list(db.scalars(insert(Lead).returning(Lead.id, sort_by_parameter_order=True), rows))
+    metrics.record(db, before={}, after=metrics.lead_counters_for(db, ids))
+    stage_lead_transitions(db, entries=[(lead_id, None, row["status"]) for lead_id, row in zip(ids, rows)])
+    if actor_user is not None:
+        stage_audit_logs(
+            db,
+            entity_type="lead",
+            action="create",
+            actor_user=actor_user,
+            entries=[(lead_id, f"Created lead: {row['name']}") for lead_id, row in zip(ids, rows)],
+        )
+    _commit(db, "leads")
+    return ids
+
+
+def update_leads_status(
+    db: Session, *, ids: list[int], status: LeadStatus, actor_user: User | None = None
+) -> list[int]:
+    """Move active leads to `status`; leads already in it are left alone. Returns the changed ids."""
+    targets = _select_in_chunks(
+        db,
+        select(Lead.id, Lead.name, Lead.status).where(Lead.deleted_at.is_(None), Lead.status != status),
+        Lead.id,
+        unique(ids),
+    )
+    lead_ids = [row.id for row in targets]
+    if lead_ids:
+        before = metrics.lead_counters_for(db, lead_ids)
+        for chunk in chunked(lead_ids):
+            db.execute(
+                update(Lead).where(Lead.id.in_(chunk)).values(status=status),
+                execution_options={"synchronize_session": False},
+            )
+        metrics.record(db, before=before, after=metrics.lead_counters_for(db, lead_ids))
+        stage_lead_transitions(db, entries=[(row.id, row.status, status) for row in targets])
+        if actor_user is not None:
+            stage_audit_logs(
+                db,
+                entity_type="lead",
+                action="status_change",
+                actor_user=actor_user,
+                entries=[
+                    (row.id, f"Lead status: {row.name} {row.status.value} → {status.value}") for row in targets
+                ],
+                changes={row.id: _changes({"status": row.status.value}, {"status": status.value}) for row in targets},
+            )
+    _commit(db, "leads")
+    return lead_ids
+
+
+def archive_leads(db: Session, *, ids: list[int], actor_user: User | None = None) -> list[int]:
+    """Archive active leads with one UPDATE per id chunk; returns the archived ids."""
+    targets = _select_in_chunks(
+        db, select(Lead.id, Lead.name).where(Lead.deleted_at.is_(None)), Lead.id, unique(ids)
     )
-    return list(db.scalars(stmt).all())
+    lead_ids = [row.id for row in targets]
+    if lead_ids:
+        now = datetime.now(timezone.utc)
+        before = metrics.lead_counters_for(db, lead_ids)
+        for chunk in chunked(lead_ids):
+            db.execute(
+                update(Lead).where(Lead.id.in_(chunk)).values(deleted_at=now),
+                execution_options={"synchronize_session": False},
+            )
+        metrics.record(db, before=before, after=metrics.lead_counters_for(db, lead_ids))
+        if actor_user is not None:
+            stage_audit_logs(
+                db,
+                entity_type="lead",
+                action="archive",
+                actor_user=actor_user,
+                entries=[(row.id, f"Archived lead: {row.name}") for row in targets],
+            )
+    _commit(db, "leads")
+    return lead_ids
+
+
+def _invoices_stmt(*, include_archived: bool, fields: tuple[str, ...] | None, filters: dict | None):
+    stmt = _select_invoices(fields)
+    if not include_archived:
+        stmt = stmt.where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
+    return stmt.where(*_filter_conditions(_INVOICE_FILTERS, filters))
+
+
+def _count_invoices(db: Session, *, include_archived: bool, filters: dict | None) -> int:
+    stmt = select(func.count()).select_from(Invoice)
+    if not include_archived:
+        stmt = stmt.join(Invoice.client).where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
+    stmt = stmt.where(*_filter_conditions(_INVOICE_FILTERS, filters))
+    return _cached_count(db, ("invoices", include_archived, _filters_key(filters)), stmt)
+
+
+def list_invoices(
+    db: Session,
+    *,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-issued_at",
+) -> list[dict]:
+    order_col, descending = _sort_order(INVOICE_SORTS, sort)
+    stmt = _invoices_stmt(include_archived=False, fields=fields, filters=filters)
+    return _rows(db, _ordered(stmt, Invoice, order_col, descending=descending))
 
 
-def list_invoices_including_archived(db: Session) -> list[Invoice]:
-    stmt = select(Invoice).options(selectinload(Invoice.client)).order_by(Invoice.issued_at.desc())
-    return list(db.scalars(stmt).all())
+def list_invoices_including_archived(
+    db: Session,
+    *,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-issued_at",
+) -> list[dict]:
+    order_col, descending = _sort_order(INVOICE_SORTS, sort)
+    stmt = _invoices_stmt(include_archived=True, fields=fields, filters=filters)
+    return _rows(db, _ordered(stmt, Invoice, order_col, descending=descending))
 
 
-def list_invoices_page(db: Session, *, offset: int, limit: int) -> tuple[list[Invoice], int]:
-    total = int(
-        db.scalar(
-            select(func.count())
-            .select_from(Invoice)
-            .join(Invoice.client)
-            .where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
-        )
-        or 0
-    )
-    stmt = (
-        select(Invoice)
-        .join(Invoice.client)
-        .where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
-        .options(selectinload(Invoice.client))
-        .order_by(Invoice.issued_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    items = list(db.scalars(stmt).all())
+def list_invoices_page(
+    db: Session,
+    *,
+    offset: int,
+    limit: int,
+    with_total: bool = True,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-issued_at",
+) -> tuple[list[dict], int | None]:
+    total = _count_invoices(db, include_archived=False, filters=filters) if with_total else None
+    order_col, descending = _sort_order(INVOICE_SORTS, sort)
+    stmt = _invoices_stmt(include_archived=False, fields=fields, filters=filters)
+    items = _rows(db, _ordered(stmt, Invoice, order_col, descending=descending).offset(offset).limit(limit))
     return items, total
 
 
 def list_invoices_page_including_archived(
-    db: Session, *, offset: int, limit: int
-) -> tuple[list[Invoice], int]:
-    total = int(db.scalar(select(func.count()).select_from(Invoice)) or 0)
-    stmt = (
-        select(Invoice)
-        .options(selectinload(Invoice.client))
-        .order_by(Invoice.issued_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    items = list(db.scalars(stmt).all())
+    db: Session,
+    *,
+    offset: int,
+    limit: int,
+    with_total: bool = True,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-issued_at",
+) -> tuple[list[dict], int | None]:
+    total = _count_invoices(db, include_archived=True, filters=filters) if with_total else None
+    order_col, descending = _sort_order(INVOICE_SORTS, sort)
+    stmt = _invoices_stmt(include_archived=True, fields=fields, filters=filters)
+    items = _rows(db, _ordered(stmt, Invoice, order_col, descending=descending).offset(offset).limit(limit))
     return items, total
 
 
+def list_invoices_keyset(
+    db: Session,
+    *,
+    include_archived: bool = False,
+    after_id: int | None,
+    limit: int,
+    fields: tuple[str, ...] | None = None,
+    filters: dict | None = None,
+    sort: str = "-issued_at",
+) -> tuple[list[dict], int | None]:
+    order_col, descending = _sort_order(INVOICE_SORTS, sort)
+    stmt = _invoices_stmt(include_archived=include_archived, fields=fields, filters=filters)
+    return _keyset_page(
+        db, stmt, model=Invoice, order_col=order_col, after_id=after_id, limit=limit, descending=descending
+    )
+
+
 def get_invoice(db: Session, *, invoice_id: int) -> Invoice | None:
     stmt = (
         select(Invoice)
@@ -309,41 +1200,229 @@ def get_invoice_including_archived(db: Session, *, invoice_id: int) -> Invoice |
     return db.scalar(stmt)
 
 
-def create_invoice(db: Session, *, data: dict) -> Invoice:
+def _invoice_counters(db: Session, invoice: Invoice) -> dict[metrics.CounterKey, float]:
+    client = invoice.client if "client" in invoice.__dict__ else db.get(Client, invoice.client_id)
+    client_active = client is not None and client.deleted_at is None
+    return metrics.invoice_counters(
+        invoice, client_active=client_active, client_id=client.id if client is not None else None
+    )
+
+
+def _reload_paid_at(db: Session, invoice: Invoice, *, written: bool) -> None:
+    """Re-read a paid_at that was set in Python, after a keep_loaded commit.
+
+    The in-memory value is timezone-aware while some databases (SQLite) read it
+    back naive; refreshing the one column makes write responses serialize it
+    exactly like later GETs.
+    """
+    if written:
+        db.refresh(invoice, ["paid_at"])
+
+
+def create_invoice(db: Session, *, client: Client, data: dict, actor_user: User | None = None) -> Invoice:
+    """Create an invoice for `client` and return it fully loaded, client included.
+
+    The insert fetches server defaults eagerly and the commit keeps the objects
+    loaded, so the response is built without another query.
+    """
     invoice = Invoice(**data)
+    invoice.client = client
+    if invoice.status is None:
+        invoice.status = InvoiceStatus.draft
     if invoice.status == InvoiceStatus.paid and invoice.paid_at is None:
         invoice.paid_at = datetime.now(timezone.utc)
     db.add(invoice)
-    db.commit()
-    db.refresh(invoice)
+    db.flush()
+    metrics.record(db, before={}, after=_invoice_counters(db, invoice))
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="invoice",
+            entity_id=invoice.id,
+            action="create",
+            actor_user=actor_user,
+            summary=f"Created invoice: {invoice.title}",
+        )
+    _commit(db, "invoices", keep_loaded=True)
+    _reload_paid_at(db, invoice, written=invoice.paid_at is not None)
     return invoice
 
 
-def update_invoice(db: Session, *, invoice: Invoice, data: dict) -> Invoice:
+def update_invoice(
+    db: Session, *, invoice: Invoice, client: Client, data: dict, actor_user: User | None = None
+) -> Invoice:
+    """Update `invoice`, moving it to `client`; returns it loaded like create_invoice."""
+    prev_status = invoice.status
+    prev_paid_at = invoice.paid_at
+    before = _invoice_counters(db, invoice)
+    snapshot = _snapshot(invoice, INVOICE_AUDITED_FIELDS)
     for k, v in data.items():
         setattr(invoice, k, v)
+    invoice.client = client
 
     if invoice.status == InvoiceStatus.paid and invoice.paid_at is None:
         invoice.paid_at = datetime.now(timezone.utc)
     if invoice.status != InvoiceStatus.paid:
         invoice.paid_at = None
+    metrics.record(db, before=before, after=_invoice_counters(db, invoice))
 
     db.add(invoice)
-    db.commit()
-    db.refresh(invoice)
+    if actor_user is not None:
+        status_changed = invoice.status != prev_status
+        stage_audit_log(
+            db,
+            entity_type="invoice",
+            entity_id=invoice.id,
+            action="status_change" if status_changed else "update",
+            actor_user=actor_user,
+            summary=(
+                f"Invoice status: {invoice.title} {prev_status.value} → {invoice.status.value}"
+                if status_changed
+                else f"Updated invoice: {invoice.title}"
+            ),
+            changes=_changes(snapshot, {**_snapshot(invoice, INVOICE_AUDITED_FIELDS), "client_id": client.id}),
+        )
+    # Unchanged, the attribute still holds the object loaded from the database.
+    paid_at_written = invoice.paid_at is not None and invoice.paid_at is not prev_paid_at
+    _commit(db, "invoices", keep_loaded=True)
+    _reload_paid_at(db, invoice, written=paid_at_written)
     return invoice
 
 
-def delete_invoice(db: Session, *, invoice: Invoice) -> None:
+def delete_invoice(db: Session, *, invoice: Invoice, actor_user: User | None = None) -> None:
     if invoice.deleted_at is None:
+        before = _invoice_counters(db, invoice)
         invoice.deleted_at = datetime.now(timezone.utc)
+        metrics.record(db, before=before, after=_invoice_counters(db, invoice))
         db.add(invoice)
-        db.commit()
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="invoice",
+            entity_id=invoice.id,
+            action="archive",
+            actor_user=actor_user,
+            summary=f"Archived invoice: {invoice.title}",
+        )
+    _commit(db, "invoices")
 
 
-def restore_invoice(db: Session, *, invoice: Invoice) -> Invoice:
+def restore_invoice(db: Session, *, invoice: Invoice, actor_user: User | None = None) -> Invoice:
+    before = _invoice_counters(db, invoice)
     invoice.deleted_at = None
+    metrics.record(db, before=before, after=_invoice_counters(db, invoice))
     db.add(invoice)
-    db.commit()
-    db.refresh(invoice)
+    if actor_user is not None:
+        stage_audit_log(
+            db,
+            entity_type="invoice",
+            entity_id=invoice.id,
+            action="restore",
+            actor_user=actor_user,
+            summary=f"Restored invoice: {invoice.title}",
+        )
+    _commit(db, "invoices", keep_loaded=True)
     return invoice
+
+
+def missing_invoice_ids(db: Session, *, ids: list[int]) -> list[int]:
+    """Ids from `ids` that do not belong to an active invoice of an active client."""
+    found = _select_in_chunks(
+        db,
+        select(Invoice.id).join(Invoice.client).where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None)),
+        Invoice.id,
+        unique(ids),
+    )
+    found_ids = {row.id for row in found}
+    return [i for i in unique(ids) if i not in found_ids]
+
+
+def create_invoices(db: Session, *, rows: list[dict], actor_user: User | None = None) -> list[int]:
+    """Insert many invoices in one transaction and return their ids in input order.
+
+    The caller checks that every client_id belongs to an active client.
+    """
+    now = datetime.now(timezone.utc)
+    prepared = []
+    for row in rows:
+        row = {**row, "status": row.get("status") or InvoiceStatus.draft}
+        if row["status"] == InvoiceStatus.paid and row.get("paid_at") is None:
+            row["paid_at"] = now
+        prepared.append(row)
+
+    ids = list(db.scalars(insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True), prepared))
+    metrics.record(db, before={}, after=metrics.invoice_counters_for(db, ids))
+    if actor_user is not None:
+        stage_audit_logs(
+            db,
+            entity_type="invoice",
+            action="create",
+            actor_user=actor_user,
+            entries=[(invoice_id, f"Created invoice: {row['title']}") for invoice_id, row in zip(ids, prepared)],
+        )
+    _commit(db, "invoices")
+    return ids
+
+
+def update_invoices_status(
+    db: Session, *, ids: list[int], status: InvoiceStatus, actor_user: User | None = None
+) -> list[int]:
+    """Move active invoices to `status`, keeping paid_at consistent. Returns the changed ids."""
+    targets = _select_in_chunks(
+        db,
+        select(Invoice.id, Invoice.title, Invoice.status)
+        .join(Invoice.client)
+        .where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None), Invoice.status != status),
+        Invoice.id,
+        unique(ids),
+    )
+    invoice_ids = [row.id for row in targets]
+    if invoice_ids:
+        paid_at = func.coalesce(Invoice.paid_at, datetime.now(timezone.utc)) if status == InvoiceStatus.paid else None
+        before = metrics.invoice_counters_for(db, invoice_ids)
+        for chunk in chunked(invoice_ids):
+            db.execute(
+                update(Invoice).where(Invoice.id.in_(chunk)).values(status=status, paid_at=paid_at),
+                execution_options={"synchronize_session": False},
+            )
+        metrics.record(db, before=before, after=metrics.invoice_counters_for(db, invoice_ids))
+        if actor_user is not None:
+            stage_audit_logs(
+                db,
+                entity_type="invoice",
+                action="status_change",
+                actor_user=actor_user,
+                entries=[
+                    (row.id, f"Invoice status: {row.title} {row.status.value} → {status.value}") for row in targets
+                ],
+                changes={row.id: _changes({"status": row.status.value}, {"status": status.value}) for row in targets},
+            )
+    _commit(db, "invoices")
+    return invoice_ids
+
+
+def archive_invoices(db: Session, *, ids: list[int], actor_user: User | None = None) -> list[int]:
+    """Archive active invoices with one UPDATE per id chunk; returns the archived ids."""
+    targets = _select_in_chunks(
+        db, select(Invoice.id, Invoice.title).where(Invoice.deleted_at.is_(None)), Invoice.id, unique(ids)
+    )
+    invoice_ids = [row.id for row in targets]
+    if invoice_ids:
+        now = datetime.now(timezone.utc)
+        before = metrics.invoice_counters_for(db, invoice_ids)
+        for chunk in chunked(invoice_ids):
+            db.execute(
+                update(Invoice).where(Invoice.id.in_(chunk)).values(deleted_at=now),
+                execution_options={"synchronize_session": False},
+            )
+        metrics.record(db, before=before, after=metrics.invoice_counters_for(db, invoice_ids))
+        if actor_user is not None:
+            stage_audit_logs(
+                db,
+                entity_type="invoice",
+                action="archive",
+                actor_user=actor_user,
+                entries=[(row.id, f"Archived invoice: {row.title}") for row in targets],
+            )
+    _commit(db, "invoices")
+    return invoice_ids
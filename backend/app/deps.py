@@ -6,9 +6,9 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal, SessionLocal, SessionRunner
 from app.models import User, UserRole
-from app.crud import get_user_by_username
+from app.crud import cached_user, get_cached_user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -21,26 +21,64 @@ def get_db():
         db.close()
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    settings = get_settings()
+async def get_db_runner():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield SessionRunner(session)
+        return
 
-    credentials_exception = HTTPException(
+    db = SessionLocal()
+    try:
+        yield SessionRunner(db)
+    finally:
+        db.close()
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials.",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _decode_token(token: str) -> dict:
+    settings = get_settings()
+
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        username: str | None = payload.get("sub")
-        if not username:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    if not payload.get("sub"):
+        raise _credentials_exception()
+    return payload
+
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    payload = _decode_token(token)
+
+    user = get_cached_user(db, username=payload["sub"])
+    if not user:
+        raise _credentials_exception()
+
+    return user
+
+
+async def get_read_user(run: SessionRunner = Depends(get_db_runner), token: str = Depends(oauth2_scheme)) -> User:
+    """Authenticate a read-only request, optionally from the token's role claim alone."""
+    payload = _decode_token(token)
+
+    if get_settings().trust_token_role_for_reads:
+        try:
+            role = UserRole(payload.get("role"))
+        except ValueError:
+            raise _credentials_exception()
+        return User(username=payload["sub"], role=role)
 
-    user = get_user_by_username(db, username=username)
+    user = cached_user(payload["sub"]) or await run(get_cached_user, username=payload["sub"])
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
 
     return user
 
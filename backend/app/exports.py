@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from sqlalchemy import Select, select, union_all
+
+from app.core.database import SessionLocal
+from app.models import AuditLog, AuditLogArchive, Client, Invoice, Lead
+
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        # Structured columns (audit `changes`) go into one cell as JSON.
+        return json.dumps(value, ensure_ascii=False)
+    return _plain(value)
+
+
+def clients_export_stmt(*, include_archived: bool) -> Select:
+    stmt = select(
+        Client.id,
+        Client.name,
+        Client.email,
+        Client.phone,
+        Client.company,
+        Client.notes,
+        Client.created_at,
+        Client.deleted_at,
+    )
+    if not include_archived:
+        stmt = stmt.where(Client.deleted_at.is_(None))
+    return stmt.order_by(Client.id)
+
+
+def leads_export_stmt(*, include_archived: bool) -> Select:
+    stmt = select(
+        Lead.id,
+        Lead.name,
+        Lead.email,
+        Lead.source,
+        Lead.status,
+        Lead.notes,
+        Lead.created_at,
+        Lead.deleted_at,
+    )
+    if not include_archived:
+        stmt = stmt.where(Lead.deleted_at.is_(None))
+    return stmt.order_by(Lead.id)
+
+
+def invoices_export_stmt(*, include_archived: bool) -> Select:
+    stmt = select(
+        Invoice.id,
+        Invoice.client_id,
+        Client.name.label("client_name"),
+        Client.company.label("client_company"),
+        Invoice.title,
+        Invoice.amount,
+        Invoice.status,
+        Invoice.issued_at,
+        Invoice.paid_at,
+        Invoice.deleted_at,
+    ).join(Invoice.client)
+    if not include_archived:
+        stmt = stmt.where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
+    return stmt.order_by(Invoice.id)
+
+
+def _audit_log_export_columns(model) -> list:
+    return [
+        model.id,
+        model.entity_type,
+        model.entity_id,
+        model.action,
+        model.actor_user_id,
+        model.actor_role,
+        model.created_at.label("timestamp"),
+        model.summary,
+        model.changes,
+    ]
+
+
+def audit_logs_export_stmt(*, include_archived: bool) -> Select:
+    """Live audit rows, plus those moved to audit_logs_archive when `include_archived`, in id order."""
+    if not include_archived:
+        return select(*_audit_log_export_columns(AuditLog)).order_by(AuditLog.id)
+    rows = union_all(
+        select(*_audit_log_export_columns(AuditLogArchive)),
+        select(*_audit_log_export_columns(AuditLog)),
+    ).subquery()
+    return select(*rows.c).order_by(rows.c.id)
+
+
+def stream_export(stmt: Select, *, fmt: str) -> Iterator[str]:
+    """Yield the rows of `stmt` as NDJSON lines or CSV records.
+
+    Uses its own session because the response body is produced after the
+    request's dependencies have been torn down. Rows are fetched in batches of
+    EXPORT_BATCH_SIZE from a server-side cursor, so memory stays flat however
+    large the table is.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for partition in result.partitions():
+                for row in partition:
+                    writer.writerow([_csv_value(value) for value in row])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+            return
+
+        for partition in result.partitions():
+            yield "".join(
+                json.dumps({key: _plain(value) for key, value in zip(columns, row)}, ensure_ascii=False) + "\n"
+                for row in partition
+            )
+    finally:
+        db.close()
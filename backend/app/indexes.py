@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Connection, Index, inspect
+
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+def managed_indexes() -> list[Index]:
+    """Every index declared on the models, in table order."""
+    indexes: list[Index] = []
+    for table in Base.metadata.sorted_tables:
+        indexes += sorted(table.indexes, key=lambda index: index.name or "")
+    return indexes
+
+
+def missing_indexes(conn: Connection) -> list[Index]:
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    existing: set[str] = set()
+    for table_name in existing_tables:
+        existing.update(index["name"] for index in inspector.get_indexes(table_name) if index.get("name"))
+    return [
+        index
+        for index in managed_indexes()
+        if index.table is not None and index.table.name in existing_tables and index.name not in existing
+    ]
+
+
+def create_missing_indexes(conn: Connection) -> list[str]:
+    """Create the managed indexes the database lacks and return their names."""
+    missing = missing_indexes(conn)
+    for index in missing:
+        index.create(conn, checkfirst=True)
+    if missing:
+        logger.info("Created missing database indexes: %s", ", ".join(index.name for index in missing))
+    return [index.name for index in missing]
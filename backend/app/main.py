@@ -1,21 +1,31 @@
 from __future__ import annotations
 
+import logging
+import time
+from collections.abc import Callable
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
 
+from app import migrations
 from app.core.config import get_settings
-from app.core.database import Base, SessionLocal, engine
+from app.core.database import SessionLocal, engine
+from app.core.serialization import default_response_class
+from app.core.security import password_hasher
+from app.routes.analytics import router as analytics_router
 from app.routes.auth import router as auth_router
 from app.routes.audit_logs import router as audit_logs_router
 from app.routes.clients import router as clients_router
 from app.routes.invoices import router as invoices_router
 from app.routes.leads import router as leads_router
+from app.routes.metrics import router as metrics_router
 from app.seed import seed_if_empty
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, default_response_class=default_response_class())
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,51 +33,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"] ,
     allow_headers=["*"] ,
-    expose_headers=["X-Total-Count", "X-Page", "X-Page-Size", "X-Total-Pages"],
+    expose_headers=["X-Total-Count", "X-Page", "X-Page-Size", "X-Total-Pages", "X-Next-Cursor", "ETag"],
 )
 
 
-def _ensure_soft_delete_columns() -> None:
-    if not settings.database_url.startswith("sqlite"):
-        return
-
-    with engine.begin() as conn:
-        for table in ["clients", "leads", "invoices"]:
-            cols = [row[1] for row in conn.execute(text(f"PRAGMA table_info({table})")).fetchall()]
-            if "deleted_at" not in cols:
-                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN deleted_at DATETIME"))
-
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS audit_logs (
-                  id INTEGER PRIMARY KEY,
-                  entity_type VARCHAR(50) NOT NULL,
-                  entity_id INTEGER NOT NULL,
-                  action VARCHAR(50) NOT NULL,
-                  actor_user_id INTEGER NOT NULL,
-                  actor_role VARCHAR(20) NOT NULL,
-                  summary VARCHAR(255),
-                  created_at DATETIME DEFAULT (CURRENT_TIMESTAMP)
-                )
-                """
-            )
+def _check_schema_version() -> None:
+    version = migrations.current_version(engine)
+    if version < migrations.head_version():
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {migrations.head_version()}; "
+            "run `python -m app.cli setup`."
         )
 
-        for idx in [
-            "CREATE INDEX IF NOT EXISTS ix_audit_logs_entity_type ON audit_logs (entity_type)",
-            "CREATE INDEX IF NOT EXISTS ix_audit_logs_entity_id ON audit_logs (entity_id)",
-            "CREATE INDEX IF NOT EXISTS ix_audit_logs_action ON audit_logs (action)",
-            "CREATE INDEX IF NOT EXISTS ix_audit_logs_actor_user_id ON audit_logs (actor_user_id)",
-            "CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at ON audit_logs (created_at)",
-        ]:
-            conn.execute(text(idx))
-
 
-@app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
-    _ensure_soft_delete_columns()
+def _seed() -> None:
     db = SessionLocal()
     try:
         seed_if_empty(db)
@@ -75,11 +54,43 @@ def on_startup():
         db.close()
 
 
+@app.on_event("startup")
+def on_startup():
+    phases: list[tuple[str, Callable[[], object]]]
+    if settings.startup_mode == "fast":
+        phases = [("schema_check", _check_schema_version)]
+    else:
+        phases = [("migrations", lambda: migrations.upgrade(engine)), ("seed", _seed)]
+
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    for name, run in phases:
+        phase_started = time.perf_counter()
+        run()
+        timings[name] = round((time.perf_counter() - phase_started) * 1000, 2)
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+
+    app.state.startup_timings_ms = timings
+    logger.info(
+        "Startup (%s mode) finished in %.2f ms: %s",
+        settings.startup_mode,
+        timings["total"],
+        ", ".join(f"{name} {ms:.2f} ms" for name, ms in timings.items() if name != "total"),
+    )
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    password_hasher.shutdown()
+
+
 app.include_router(auth_router, prefix=settings.api_v1_prefix)
 app.include_router(audit_logs_router, prefix=settings.api_v1_prefix)
 app.include_router(clients_router, prefix=settings.api_v1_prefix)
 app.include_router(leads_router, prefix=settings.api_v1_prefix)
 app.include_router(invoices_router, prefix=settings.api_v1_prefix)
+app.include_router(metrics_router, prefix=settings.api_v1_prefix)
+app.include_router(analytics_router, prefix=settings.api_v1_prefix)
 
 
 @app.get("/health")
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.batching import chunked
+from app.models import Client, Invoice, InvoiceStatus, Lead, LeadStatus, MetricCounter, RevenueRollup
+
+# Counters are keyed by flat strings so the dashboard summary is a single
+# primary-key lookup no matter how many rows the underlying tables hold.
+CLIENTS_ACTIVE = "clients.active"
+BUILT_MARKER = "_built"
+# Per-collection write counters behind the list ETags. They only ever grow and
+# are not derived from the data, so rebuild() leaves them alone. Each write bumps
+# one of CHANGE_SHARDS rows picked at random and the version is their sum, so
+# concurrent writers rarely wait on the same row lock. The dashboard counters
+# above are still one row per key: writes that change the same counter (say,
+# two new leads) serialize on it until their transactions commit.
+CHANGES_PREFIX = "changes."
+CHANGE_SHARDS = 16
+
+ACTIVE_LEAD_STATUSES = (LeadStatus.new, LeadStatus.contacted, LeadStatus.qualified)
+
+
+class RevenueKey(NamedTuple):
+    """A counter key addressing one measure of a revenue rollup row.
+
+    These travel in the same snapshots as the string keys, so every write path
+    that records counter diffs keeps the rollup table current too.
+    """
+
+    day: date
+    client_id: int
+    status: InvoiceStatus
+    measure: str  # "count" or "amount"
+
+
+CounterKey = str | RevenueKey
+
+
+def lead_status_key(status: LeadStatus) -> str:
+    return f"leads.{status.value}"
+
+
+def invoice_count_key(status: InvoiceStatus) -> str:
+    return f"invoices.{status.value}.count"
+
+
+def invoice_amount_key(status: InvoiceStatus) -> str:
+    return f"invoices.{status.value}.amount"
+
+
+def paid_revenue_key(moment: datetime) -> str:
+    return f"revenue.paid.{moment:%Y-%m}"
+
+
+def changes_key(entity_type: str) -> str:
+    return f"{CHANGES_PREFIX}{entity_type}"
+
+
+def client_counters(client: Client) -> dict[str, float]:
+    if client.deleted_at is not None:
+        return {}
+    return {CLIENTS_ACTIVE: 1}
+
+
+def lead_counters(lead: Lead) -> dict[str, float]:
+    if lead.deleted_at is not None:
+        return {}
+    return {lead_status_key(lead.status): 1}
+
+
+def as_utc(moment: datetime) -> datetime:
+    """`moment` as an aware UTC datetime; SQLite returns stored UTC times naive."""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+
+def revenue_day(status: InvoiceStatus, issued_at: datetime | None, paid_at: datetime | None) -> date:
+    """The rollup day of an invoice: when it was paid, or when it was issued otherwise."""
+    moment = (paid_at or issued_at) if status == InvoiceStatus.paid else issued_at
+    return (moment or datetime.now(timezone.utc)).date()
+
+
+def invoice_counters(invoice: Invoice, *, client_active: bool, client_id: int | None = None) -> dict[CounterKey, float]:
+    """Counter contribution of one invoice; `client_id` overrides a not yet flushed move."""
+    if invoice.deleted_at is not None or not client_active:
+        return {}
+
+    counters: dict[CounterKey, float] = {
+        invoice_count_key(invoice.status): 1,
+        invoice_amount_key(invoice.status): invoice.amount,
+    }
+    if invoice.status == InvoiceStatus.paid:
+        paid_at = invoice.paid_at or invoice.issued_at or datetime.now(timezone.utc)
+        counters[paid_revenue_key(paid_at)] = invoice.amount
+
+    day = revenue_day(invoice.status, invoice.issued_at, invoice.paid_at)
+    client_id = invoice.client_id if client_id is None else client_id
+    counters[RevenueKey(day, client_id, invoice.status, "count")] = 1
+    counters[RevenueKey(day, client_id, invoice.status, "amount")] = invoice.amount
+    return counters
+
+
+def combine(*parts: dict[CounterKey, float]) -> dict[CounterKey, float]:
+    total: dict[CounterKey, float] = defaultdict(float)
+    for part in parts:
+        for key, value in part.items():
+            total[key] += value
+    return dict(total)
+
+
+def lead_counters_for(db: Session, lead_ids: list[int]) -> dict[CounterKey, float]:
+    """Current counter contribution of the given leads, read in id chunks."""
+    parts = []
+    for chunk in chunked(lead_ids):
+        rows = db.execute(select(Lead.status, Lead.deleted_at).where(Lead.id.in_(chunk)))
+        parts += [lead_counters(row) for row in rows]
+    return combine(*parts)
+
+
+def _invoice_rows_counters(db: Session, condition) -> list[dict[CounterKey, float]]:
+    rows = db.execute(
+        select(
+            Invoice.client_id,
+            Invoice.status,
+            Invoice.amount,
+            Invoice.issued_at,
+            Invoice.paid_at,
+            Invoice.deleted_at,
+            Client.deleted_at.label("client_deleted_at"),
+        )
+        .join(Invoice.client)
+        .where(condition)
+    )
+    return [invoice_counters(row, client_active=row.client_deleted_at is None) for row in rows]
+
+
+def invoice_counters_for(db: Session, invoice_ids: list[int]) -> dict[CounterKey, float]:
+    """Current counter contribution of the given invoices, read in id chunks."""
+    parts = []
+    for chunk in chunked(invoice_ids):
+        parts += _invoice_rows_counters(db, Invoice.id.in_(chunk))
+    return combine(*parts)
+
+
+def client_tree_counters_for(db: Session, client_ids: list[int]) -> dict[CounterKey, float]:
+    """Counter contribution of the given clients together with all of their invoices."""
+    parts = []
+    for chunk in chunked(client_ids):
+        rows = db.execute(select(Client.deleted_at).where(Client.id.in_(chunk)))
+        parts += [client_counters(row) for row in rows]
+        parts += _invoice_rows_counters(db, Invoice.client_id.in_(chunk))
+    return combine(*parts)
+
+
+def record(db: Session, *, before: dict[CounterKey, float], after: dict[CounterKey, float]) -> None:
+    """Apply the difference between two counter snapshots inside the caller's transaction."""
+    rollup: dict[tuple, dict[str, float]] = defaultdict(lambda: {"count": 0, "amount": 0.0})
+    for key in before.keys() | after.keys():
+        delta = after.get(key, 0) - before.get(key, 0)
+        if not delta:
+            continue
+        if isinstance(key, RevenueKey):
+            rollup[key.day, key.client_id, key.status][key.measure] += delta
+        else:
+            _bump(db, key, delta)
+
+    for (day, client_id, status), deltas in rollup.items():
+        _bump_revenue(db, day, client_id, status, count=int(deltas["count"]), amount=deltas["amount"])
+
+
+def _bump(db: Session, key: str, delta: float) -> None:
+    table = MetricCounter.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table).values(key=key, value=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"value": table.c.value + stmt.excluded.value},
+        )
+        db.execute(stmt)
+        return
+
+    result = db.execute(update(table).where(table.c.key == key).values(value=table.c.value + delta))
+    if result.rowcount == 0:
+        db.execute(insert(table).values(key=key, value=delta))
+
+
+def _bump_revenue(db: Session, day: date, client_id: int, status: InvoiceStatus, *, count: int, amount: float) -> None:
+    table = RevenueRollup.__table__
+    dialect = db.get_bind().dialect.name
+    key = (table.c.day == day) & (table.c.client_id == client_id) & (table.c.status == status)
+
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(table).values(
+            day=day, client_id=client_id, status=status, invoice_count=count, amount=amount
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.day, table.c.client_id, table.c.status],
+            set_={
+                "invoice_count": table.c.invoice_count + stmt.excluded.invoice_count,
+                "amount": table.c.amount + stmt.excluded.amount,
+            },
+        )
+        db.execute(stmt)
+        return
+
+    result = db.execute(
+        update(table)
+        .where(key)
+        .values(invoice_count=table.c.invoice_count + count, amount=table.c.amount + amount)
+    )
+    if result.rowcount == 0:
+        db.execute(
+            insert(table).values(day=day, client_id=client_id, status=status, invoice_count=count, amount=amount)
+        )
+
+
+def _change_keys(entity_type: str) -> list[str]:
+    # The unsharded key holds the count from before sharding, keeping versions monotonic.
+    base = changes_key(entity_type)
+    return [base, *(f"{base}.{shard}" for shard in range(CHANGE_SHARDS))]
+
+
+def bump_changes(db: Session, *entity_types: str) -> None:
+    """Count a write against each collection, inside the caller's transaction."""
+    shard = random.randrange(CHANGE_SHARDS)
+    for entity_type in entity_types:
+        _bump(db, f"{changes_key(entity_type)}.{shard}", 1)
+
+
+def change_version(db: Session, entity_type: str) -> int:
+    """Writes counted against `entity_type` so far: a primary-key read of its shard rows."""
+    stmt = select(func.sum(MetricCounter.value)).where(MetricCounter.key.in_(_change_keys(entity_type)))
+    return int(db.scalar(stmt) or 0)
+
+
+def is_built(db: Session) -> bool:
+    return db.get(MetricCounter, BUILT_MARKER) is not None
+
+
+def rebuild(db: Session) -> None:
+    """Recompute every counter from the source tables. Only needed once per database."""
+    counters: dict[str, float] = defaultdict(float)
+
+    counters[CLIENTS_ACTIVE] = float(
+        db.scalar(select(func.count()).select_from(Client).where(Client.deleted_at.is_(None))) or 0
+    )
+
+    lead_rows = db.execute(
+        select(Lead.status, func.count()).where(Lead.deleted_at.is_(None)).group_by(Lead.status)
+    )
+    for status, count in lead_rows:
+        counters[lead_status_key(status)] = float(count)
+
+    active_invoices = (
+        select(Invoice.status, Invoice.amount, Invoice.issued_at, Invoice.paid_at)
+        .join(Invoice.client)
+        .where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
+        .execution_options(yield_per=1000)
+    )
+    for status, amount, issued_at, paid_at in db.execute(active_invoices):
+        counters[invoice_count_key(status)] += 1
+        counters[invoice_amount_key(status)] += amount
+        if status == InvoiceStatus.paid:
+            counters[paid_revenue_key(paid_at or issued_at)] += amount
+
+    db.execute(delete(MetricCounter).where(MetricCounter.key.not_like(f"{CHANGES_PREFIX}%")))
+    rows = [{"key": key, "value": value} for key, value in counters.items()]
+    rows.append({"key": BUILT_MARKER, "value": 1.0})
+    db.execute(insert(MetricCounter), rows)
+    db.commit()
+
+
+def rebuild_revenue_rollup(db: Session) -> int:
+    """Recompute the revenue rollup from the invoices table; returns the rows written.
+
+    Writes keep the rollup current, so this is only needed to backfill existing
+    data or to repair it.
+    """
+    cells: dict[tuple, list[float]] = defaultdict(lambda: [0, 0.0])
+    active_invoices = (
+        select(Invoice.client_id, Invoice.status, Invoice.amount, Invoice.issued_at, Invoice.paid_at)
+        .join(Invoice.client)
+        .where(Invoice.deleted_at.is_(None), Client.deleted_at.is_(None))
+        .execution_options(yield_per=1000)
+    )
+    for client_id, status, amount, issued_at, paid_at in db.execute(active_invoices):
+        cell = cells[revenue_day(status, issued_at, paid_at), client_id, status]
+        cell[0] += 1
+        cell[1] += amount
+
+    db.execute(delete(RevenueRollup))
+    rows = [
+        {"day": day, "client_id": client_id, "status": status, "invoice_count": count, "amount": amount}
+        for (day, client_id, status), (count, amount) in cells.items()
+    ]
+    for chunk in chunked(rows):
+        db.execute(insert(RevenueRollup), list(chunk))
+    db.commit()
+    return len(rows)
+
+
+def read_summary(db: Session) -> dict:
+    now = datetime.now(timezone.utc)
+    revenue_key = paid_revenue_key(now)
+
+    keys = [CLIENTS_ACTIVE, revenue_key]
+    keys += [lead_status_key(status) for status in LeadStatus]
+    for status in InvoiceStatus:
+        keys += [invoice_count_key(status), invoice_amount_key(status)]
+
+    values = dict(db.execute(select(MetricCounter.key, MetricCounter.value).where(MetricCounter.key.in_(keys))).all())
+
+    leads_by_status = {status: int(values.get(lead_status_key(status), 0)) for status in LeadStatus}
+    return {
+        "total_clients": int(values.get(CLIENTS_ACTIVE, 0)),
+        "active_leads": sum(leads_by_status[status] for status in ACTIVE_LEAD_STATUSES),
+        "leads_by_status": leads_by_status,
+        "invoices_by_status": {
+            status: {
+                "count": int(values.get(invoice_count_key(status), 0)),
+                "amount": round(values.get(invoice_amount_key(status), 0.0), 2),
+            }
+            for status in InvoiceStatus
+        },
+        "monthly_revenue": round(values.get(revenue_key, 0.0), 2),
+    }
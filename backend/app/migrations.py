@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app import analytics, metrics
+from app.core.config import get_settings
+from app.core.database import Base
+from app.indexes import create_missing_indexes
+from app.search import get_client_search
+
+logger = logging.getLogger(__name__)
+
+# Kept out of Base.metadata so create_all never touches it.
+_version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+MigrationFn = Callable[[Connection], None]
+
+# (version, name, upgrade), applied in order. Every step must be safe to run
+# against databases created before migrations existed, so they check before
+# they create.
+MIGRATIONS: list[tuple[int, str, MigrationFn]] = []
+
+
+def migration(version: int, name: str) -> Callable[[MigrationFn], MigrationFn]:
+    def register(fn: MigrationFn) -> MigrationFn:
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} is out of order.")
+        MIGRATIONS.append((version, name, fn))
+        return fn
+
+    return register
+
+
+def _add_column_if_missing(conn: Connection, table_name: str, column_name: str) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns(table_name)}
+    if column_name in columns:
+        return
+    column = Base.metadata.tables[table_name].c[column_name]
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column.type.compile(dialect=conn.dialect)}"
+    if column.server_default is not None:
+        # Existing rows take the default, which is what lets NOT NULL be added.
+        ddl += f" DEFAULT {column.server_default.arg}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    conn.exec_driver_sql(ddl)
+
+
+@migration(1, "baseline tables")
+def _baseline(conn: Connection) -> None:
+    Base.metadata.create_all(conn, checkfirst=True)
+    # Databases from before soft delete lack deleted_at.
+    for table_name in ("clients", "leads", "invoices"):
+        _add_column_if_missing(conn, table_name, "deleted_at")
+
+
+@migration(2, "list query indexes")
+def _list_query_indexes(conn: Connection) -> None:
+    create_missing_indexes(conn)
+
+
+@migration(3, "client search index")
+def _client_search_index(conn: Connection) -> None:
+    get_client_search().setup(conn)
+
+
+@migration(4, "dashboard metric counters")
+def _metric_counters(conn: Connection) -> None:
+    with Session(bind=conn) as db:
+        if not metrics.is_built(db):
+            metrics.rebuild(db)
+
+
+@migration(5, "row versions")
+def _row_versions(conn: Connection) -> None:
+    for table_name in ("clients", "leads", "invoices"):
+        _add_column_if_missing(conn, table_name, "version")
+        _add_column_if_missing(conn, table_name, "updated_at")
+
+
+@migration(6, "list filter indexes")
+def _list_filter_indexes(conn: Connection) -> None:
+    create_missing_indexes(conn)
+
+
+@migration(7, "revenue rollup")
+def _revenue_rollup(conn: Connection) -> None:
+    Base.metadata.tables["revenue_rollups"].create(conn, checkfirst=True)
+    create_missing_indexes(conn)
+    with Session(bind=conn) as db:
+        metrics.rebuild_revenue_rollup(db)
+
+
+@migration(8, "lead status transitions")
+def _lead_status_transitions(conn: Connection) -> None:
+    Base.metadata.tables["lead_status_transitions"].create(conn, checkfirst=True)
+    create_missing_indexes(conn)
+    with Session(bind=conn) as db:
+        analytics.backfill_lead_transitions(db)
+
+
+@migration(9, "audit log archive and filter indexes")
+def _audit_log_archive(conn: Connection) -> None:
+    Base.metadata.tables["audit_logs_archive"].create(conn, checkfirst=True)
+    create_missing_indexes(conn)
+
+
+@migration(10, "audit log field changes")
+def _audit_log_changes(conn: Connection) -> None:
+    for table_name in ("audit_logs", "audit_logs_archive"):
+        _add_column_if_missing(conn, table_name, "changes")
+
+
+def head_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(engine: Engine) -> int:
+    """The applied schema version: a single query, 0 for an unmigrated database."""
+    try:
+        with engine.connect() as conn:
+            return int(conn.execute(select(func.max(schema_version.c.version))).scalar() or 0)
+    except DBAPIError:
+        # No schema_version table yet.
+        return 0
+
+
+# Arbitrary key for PostgreSQL's advisory lock; any constant shared by all workers works.
+_PG_LOCK_KEY = 7_311_015
+# How long a worker waits for another one that is already migrating (SQLite).
+_SQLITE_LOCK_TIMEOUT_MS = 10 * 60 * 1000
+
+
+def _lock(conn: Connection) -> None:
+    """Serialize upgrades across processes for the rest of the transaction."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        conn.exec_driver_sql(f"PRAGMA busy_timeout = {_SQLITE_LOCK_TIMEOUT_MS}")
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif dialect == "postgresql":
+        conn.exec_driver_sql(f"SELECT pg_advisory_xact_lock({_PG_LOCK_KEY})")
+
+
+def upgrade(engine: Engine) -> list[int]:
+    """Apply pending migrations in one locked transaction; returns the versions applied.
+
+    When several workers start at once, one migrates while the others wait on the
+    lock and then find nothing left to do.
+    """
+    if current_version(engine) >= head_version():
+        return []
+
+    # Resolve the search backend up front; probing FTS5 needs its own connection.
+    get_client_search()
+
+    applied: list[int] = []
+    with engine.connect() as conn:
+        try:
+            with conn.begin():
+                _lock(conn)
+                schema_version.create(conn, checkfirst=True)
+                version = int(conn.execute(select(func.max(schema_version.c.version))).scalar() or 0)
+                for target, name, fn in MIGRATIONS:
+                    if target <= version:
+                        continue
+                    fn(conn)
+                    conn.execute(
+                        insert(schema_version).values(version=target, name=name, applied_at=datetime.now(timezone.utc))
+                    )
+                    applied.append(target)
+        finally:
+            if conn.dialect.name == "sqlite":
+                conn.exec_driver_sql(f"PRAGMA busy_timeout = {int(get_settings().sqlite_busy_timeout_ms)}")
+                conn.commit()
+
+    for target, name, _ in MIGRATIONS:
+        if target in applied:
+            logger.info("Applied migration %s: %s", target, name)
+    return applied
+
+
+def pending(engine: Engine) -> list[tuple[int, str]]:
+    version = current_version(engine)
+    return [(v, name) for v, name, _ in MIGRATIONS if v > version]
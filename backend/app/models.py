@@ -1,9 +1,22 @@
 from __future__ import annotations
 
 import enum
-from datetime import datetime
-
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, Integer, String, Text, func
+from datetime import date, datetime
+
+from sqlalchemy import (
+    JSON,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    literal_column,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -27,6 +40,19 @@ class InvoiceStatus(str, enum.Enum):
     paid = "paid"
 
 
+class Versioned:
+    """Row version and last-update time, kept current by the database on every UPDATE.
+
+    Both are SQL-side onupdate defaults, so set-based UPDATE statements bump
+    them as well as ORM flushes. Used to build ETags.
+    """
+
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1", onupdate=literal_column("version") + 1
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, onupdate=func.now())
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -38,8 +64,9 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
-class Client(Base):
+class Client(Versioned, Base):
     __tablename__ = "clients"
+    __table_args__ = (Index("ix_clients_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -54,8 +81,9 @@ class Client(Base):
     invoices: Mapped[list[Invoice]] = relationship("Invoice", back_populates="client", cascade="all, delete-orphan")
 
 
-class Lead(Base):
+class Lead(Versioned, Base):
     __tablename__ = "leads"
+    __table_args__ = (Index("ix_leads_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -68,8 +96,35 @@ class Lead(Base):
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
-class Invoice(Base):
+class LeadStatusTransition(Base):
+    """One status change of a lead; creation is recorded with `from_status` NULL.
+
+    `seconds_in_stage` is how long the lead spent in `from_status` before this
+    change, captured at write time so funnel reports only aggregate this table.
+    """
+
+    __tablename__ = "lead_status_transitions"
+    __table_args__ = (
+        Index("ix_lead_status_transitions_lead_changed_at", "lead_id", "changed_at"),
+        Index("ix_lead_status_transitions_to_changed_at", "to_status", "changed_at", "lead_id"),
+        Index(
+            "ix_lead_status_transitions_from_changed_at", "from_status", "changed_at", "to_status", "seconds_in_stage"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    lead_id: Mapped[int] = mapped_column(ForeignKey("leads.id"), nullable=False)
+    from_status: Mapped[LeadStatus | None] = mapped_column(Enum(LeadStatus), nullable=True)
+    to_status: Mapped[LeadStatus] = mapped_column(Enum(LeadStatus), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    seconds_in_stage: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class Invoice(Versioned, Base):
     __tablename__ = "invoices"
+    __table_args__ = (Index("ix_invoices_issued_at_id", "issued_at", "id"),)
+    # Fetch issued_at with the INSERT so a new invoice can be returned without a refresh.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     client_id: Mapped[int] = mapped_column(ForeignKey("clients.id"), nullable=False, index=True)
@@ -85,10 +140,8 @@ class Invoice(Base):
     client: Mapped[Client] = relationship("Client", back_populates="invoices")
 
 
-class AuditLog(Base):
-    __tablename__ = "audit_logs"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+class AuditLogFields:
+    """Columns shared by the live audit table and its archive."""
 
     entity_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     entity_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
@@ -98,5 +151,115 @@ class AuditLog(Base):
     actor_role: Mapped[str] = mapped_column(String(20), nullable=False)
 
     summary: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # {"field": {"before": ..., "after": ...}} for the fields an update changed.
+    changes: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class AuditLog(AuditLogFields, Base):
+    __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_actor_created_at", "actor_user_id", "created_at"),
+        Index("ix_audit_logs_action_created_at", "action", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+
+
+class AuditLogArchive(AuditLogFields, Base):
+    """Audit rows moved out of audit_logs by `python -m app.cli compact-audit-logs`.
+
+    Rows keep their original ids, so the two tables never overlap and the live
+    table only holds the retention window that day-to-day queries touch.
+    """
+
+    __tablename__ = "audit_logs_archive"
+    __table_args__ = (
+        Index("ix_audit_logs_archive_created_at_id", "created_at", "id"),
+        Index("ix_audit_logs_archive_entity_created_at", "entity_type", "entity_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+
+
+class MetricCounter(Base):
+    __tablename__ = "metric_counters"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    value: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class RevenueRollup(Base):
+    """Active invoice totals per day, client and status, maintained with the metric counters.
+
+    Paid invoices count on the day they were paid, drafts and sent invoices on
+    the day they were issued, so revenue reports never read the invoices table.
+    """
+
+    __tablename__ = "revenue_rollups"
+    __table_args__ = (Index("ix_revenue_rollups_client_day", "client_id", "day"),)
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    client_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[InvoiceStatus] = mapped_column(Enum(InvoiceStatus), primary_key=True)
+    invoice_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+# Indexes for the hot list queries. Active-row indexes are partial where the
+# database supports it (SQLite, PostgreSQL) so archived rows never bloat them;
+# their column order matches the `created_at DESC, id DESC` listing order.
+Index(
+    "ix_clients_active_created_at_id",
+    Client.created_at.desc(),
+    Client.id.desc(),
+    sqlite_where=Client.deleted_at.is_(None),
+    postgresql_where=Client.deleted_at.is_(None),
+)
+Index(
+    "ix_leads_active_created_at_id",
+    Lead.created_at.desc(),
+    Lead.id.desc(),
+    sqlite_where=Lead.deleted_at.is_(None),
+    postgresql_where=Lead.deleted_at.is_(None),
+)
+Index(
+    "ix_leads_active_status_created_at",
+    Lead.status,
+    Lead.created_at,
+    sqlite_where=Lead.deleted_at.is_(None),
+    postgresql_where=Lead.deleted_at.is_(None),
+)
+Index(
+    "ix_leads_active_source_created_at",
+    Lead.source,
+    Lead.created_at,
+    sqlite_where=Lead.deleted_at.is_(None),
+    postgresql_where=Lead.deleted_at.is_(None),
+)
+Index(
+    "ix_invoices_active_issued_at_id",
+    Invoice.issued_at.desc(),
+    Invoice.id.desc(),
+    sqlite_where=Invoice.deleted_at.is_(None),
+    postgresql_where=Invoice.deleted_at.is_(None),
+)
+Index("ix_invoices_client_status_issued_at", Invoice.client_id, Invoice.status, Invoice.issued_at)
+# Backing the invoice list filters and sorts that do not start with client_id.
+Index(
+    "ix_invoices_active_status_issued_at",
+    Invoice.status,
+    Invoice.issued_at,
+    sqlite_where=Invoice.deleted_at.is_(None),
+    postgresql_where=Invoice.deleted_at.is_(None),
+)
+Index(
+    "ix_invoices_active_amount_id",
+    Invoice.amount,
+    Invoice.id,
+    sqlite_where=Invoice.deleted_at.is_(None),
+    postgresql_where=Invoice.deleted_at.is_(None),
+)
+Index("ix_audit_logs_entity_created_at", AuditLog.entity_type, AuditLog.entity_id, AuditLog.created_at)
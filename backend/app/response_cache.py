@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, NamedTuple, Protocol
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.etag import make_etag
+from app.core.serialization import dump_json
+
+logger = logging.getLogger(__name__)
+
+# Response headers that describe the cached body and are replayed on a hit.
+_REPLAYED_HEADER_PREFIX = "x-"
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: dict[str, str]
+
+    def encode(self) -> bytes:
+        return json.dumps(self.headers).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> CachedResponse:
+        headers, _, body = raw.partition(b"\n")
+        return cls(body=body, headers=json.loads(headers))
+
+
+class ResponseCache(Protocol):
+    """Serialized list responses keyed by collection version, role and query params.
+
+    Keys embed the collection's change counter, so a write anywhere makes older
+    entries unreachable; invalidate() only frees local memory early.
+    """
+
+    def get(self, collection: str, key: str) -> CachedResponse | None: ...
+
+    def set(self, collection: str, key: str, value: CachedResponse) -> None: ...
+
+    def invalidate(self, *collections: str) -> None: ...
+
+
+class NullResponseCache:
+    def get(self, collection: str, key: str) -> CachedResponse | None:
+        return None
+
+    def set(self, collection: str, key: str, value: CachedResponse) -> None:
+        return None
+
+    def invalidate(self, *collections: str) -> None:
+        return None
+
+
+class MemoryResponseCache:
+    """Per-process LRU; entries also expire after the configured TTL."""
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, collection: str, key: str) -> CachedResponse | None:
+        return self._cache.get((collection, key))
+
+    def set(self, collection: str, key: str, value: CachedResponse) -> None:
+        self._cache.set((collection, key), value)
+
+    def invalidate(self, *collections: str) -> None:
+        for collection in collections:
+            self._cache.invalidate_prefix((collection,))
+
+
+class RedisResponseCache:
+    """Shared cache in a Redis-compatible server; stale versions simply expire."""
+
+    def __init__(self, *, url: str, ttl: float, prefix: str = "clientops:responses:") -> None:
+        # Imported lazily so redis is only required when this backend is configured.
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._ttl_ms = max(1, int(ttl * 1000))
+        self._prefix = prefix
+
+    def get(self, collection: str, key: str) -> CachedResponse | None:
+        try:
+            raw = self._client.get(f"{self._prefix}{collection}:{key}")
+        except Exception:  # a cache outage must not fail the request
+            logger.warning("Response cache read failed.", exc_info=True)
+            return None
+        return CachedResponse.decode(raw) if raw is not None else None
+
+    def set(self, collection: str, key: str, value: CachedResponse) -> None:
+        try:
+            self._client.set(f"{self._prefix}{collection}:{key}", value.encode(), px=self._ttl_ms)
+        except Exception:
+            logger.warning("Response cache write failed.", exc_info=True)
+
+    def invalidate(self, *collections: str) -> None:
+        return None
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    settings = get_settings()
+    backend = settings.response_cache_backend
+    if backend == "none" or settings.response_cache_ttl_seconds <= 0:
+        return NullResponseCache()
+    if backend == "redis":
+        return RedisResponseCache(url=settings.response_cache_redis_url, ttl=settings.response_cache_ttl_seconds)
+    if backend != "memory":
+        logger.warning("Unknown response_cache_backend %r; using the in-process cache.", backend)
+    return MemoryResponseCache(
+        maxsize=settings.response_cache_max_entries,
+        ttl=settings.response_cache_ttl_seconds,
+    )
+
+
+def cache_key(request: Request, *, version: int, role: Any) -> str:
+    role = getattr(role, "value", role)
+    params = sorted(request.query_params.multi_items())
+    return f"{version}:{role}:" + "&".join(f"{name}={value}" for name, value in params)
+
+
+def list_etag(request: Request, *, collection: str, version: int, role: Any) -> str:
+    """ETag of a list response: the collection version plus a digest of the role and query.
+
+    Paging, filters, sort and projection all change the body, so a validator for
+    one query must not match another query on the same collection.
+    """
+    role = getattr(role, "value", role)
+    params = sorted(request.query_params.multi_items())
+    digest = hashlib.blake2b(json.dumps([role, params]).encode(), digest_size=8).hexdigest()
+    return make_etag(collection, version, digest)
+
+
+async def cached_list_response(
+    request: Request,
+    response: Response,
+    *,
+    collection: str,
+    version: int,
+    role: Any,
+    compute: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve a list route from the response cache, computing and storing it on a miss.
+
+    `compute` returns the items as plain row dicts and sets the paging headers on
+    `response`; the serialized body and those headers are what gets cached.
+    """
+    cache = get_response_cache()
+    key = cache_key(request, version=version, role=role)
+
+    cached = cache.get(collection, key)
+    if cached is None:
+        items = await compute()
+        cached = CachedResponse(
+            body=dump_json(items),
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower().startswith(_REPLAYED_HEADER_PREFIX)
+            },
+        )
+        cache.set(collection, key, cached)
+
+    headers = dict(cached.headers)
+    if "etag" in response.headers:
+        headers["ETag"] = response.headers["etag"]
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -1,3 +1,3 @@
-from app.routes import auth, clients, invoices, leads
+from app.routes import auth, clients, invoices, leads, metrics
 
-__all__ = ["auth", "clients", "leads", "invoices"]
+__all__ = ["auth", "clients", "leads", "invoices", "metrics"]
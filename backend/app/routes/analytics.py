@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app import analytics
+from app.core.database import SessionRunner
+from app.deps import get_db_runner, get_read_user
+from app.schemas import LeadFunnelReport, RevenueBucket, RevenueReport
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+def _resolve_window(start: date | None, end: date | None) -> tuple[date, date]:
+    end = end or datetime.now(timezone.utc).date() + timedelta(days=1)
+    start = start or end - timedelta(days=365)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end.")
+    return start, end
+
+
+@router.get("/revenue", response_model=RevenueReport)
+async def get_revenue(
+    bucket: RevenueBucket = Query(default="month"),
+    start: date | None = Query(default=None, description="Defaults to 365 days before `end`."),
+    end: date | None = Query(default=None, description="Exclusive upper bound; defaults to tomorrow (UTC)."),
+    client_id: int | None = Query(default=None),
+    client_limit: int = Query(default=20, ge=1, le=500),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(get_read_user),
+):
+    start, end = _resolve_window(start, end)
+    return await run(
+        analytics.revenue_report,
+        bucket=bucket,
+        start=start,
+        end=end,
+        client_id=client_id,
+        client_limit=client_limit,
+    )
+
+
+@router.get("/lead-funnel", response_model=LeadFunnelReport)
+async def get_lead_funnel(
+    start: date | None = Query(default=None, description="Defaults to 365 days before `end`."),
+    end: date | None = Query(default=None, description="Exclusive upper bound; defaults to tomorrow (UTC)."),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(get_read_user),
+):
+    start, end = _resolve_window(start, end)
+    return await run(analytics.lead_funnel, start=start, end=end)
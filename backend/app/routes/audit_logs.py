@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, Response
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app import crud
+from app import crud, exports, metrics
+from app.core.etag import etag_matches, not_modified
+from app.core.pagination import decode_cursor, encode_cursor
 from app.deps import get_db, require_admin
+from app.response_cache import list_etag
 from app.schemas import AuditLogRead
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
@@ -12,23 +18,87 @@ router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 
 @router.get("", response_model=list[AuditLogRead])
 def list_audit_logs(
+    request: Request,
     response: Response,
     page: int | None = Query(default=None, ge=1),
     page_size: int | None = Query(default=None, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque value from X-Next-Cursor; send it empty to start cursor pagination.",
+    ),
+    with_total: bool = Query(default=True, description="Set to false to skip counting and omit X-Total-Count."),
+    entity_type: str | None = Query(default=None),
+    entity_id: int | None = Query(default=None),
+    action: list[str] | None = Query(default=None),
+    actor_user_id: int | None = Query(default=None),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None, description="Exclusive upper bound."),
+    archived: bool = Query(default=False, description="Read rows moved to the archive by compact-audit-logs."),
+    if_none_match: str | None = Header(default=None),
     db: Session = Depends(get_db),
-    _=Depends(require_admin),
+    current_user=Depends(require_admin),
 ):
+    etag = list_etag(
+        request, collection="audit_logs", version=metrics.change_version(db, "audit_logs"), role=current_user.role
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    filters = {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "actor_user_id": actor_user_id,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        limit = page_size or 20
+        items, next_id = crud.list_audit_logs_keyset(
+            db, after_id=after_id, limit=limit, archived=archived, filters=filters
+        )
+        response.headers["X-Page-Size"] = str(limit)
+        if next_id is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+        return items
+
     if page is None and page_size is None:
-        return crud.list_audit_logs(db)
+        return crud.list_audit_logs(db, archived=archived, filters=filters)
 
     current_page = page or 1
     current_page_size = page_size or 20
     offset = (current_page - 1) * current_page_size
-    items, total = crud.list_audit_logs_page(db, offset=offset, limit=current_page_size)
+    items, total = crud.list_audit_logs_page(
+        db,
+        offset=offset,
+        limit=current_page_size,
+        with_total=with_total,
+        archived=archived,
+        filters=filters,
+    )
 
-    total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
-    response.headers["X-Total-Count"] = str(total)
     response.headers["X-Page"] = str(current_page)
     response.headers["X-Page-Size"] = str(current_page_size)
-    response.headers["X-Total-Pages"] = str(total_pages)
+    if total is not None:
+        total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Pages"] = str(total_pages)
     return items
+
+
+@router.get("/export")
+def export_audit_logs(
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_archived: bool = Query(default=False, description="Also export rows moved to the archive."),
+    _=Depends(require_admin),
+):
+    return StreamingResponse(
+        exports.stream_export(exports.audit_logs_export_stmt(include_archived=include_archived), fmt=fmt),
+        media_type=exports.EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="audit-logs.{fmt}"'},
+    )
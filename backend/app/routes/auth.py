@@ -3,12 +3,13 @@ from __future__ import annotations
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.security import create_access_token, verify_password
-from app.crud import get_user_by_username
+from app.core.security import PasswordHashingBusyError, create_access_token, password_hasher
+from app.crud import get_user_by_username, update_user_password_hash
 from app.deps import get_current_user, get_db
 from app.schemas import Token, UserPublic
 
@@ -16,11 +17,25 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = get_user_by_username(db, username=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await run_in_threadpool(get_user_by_username, db, username=form_data.username)
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password.")
 
+    try:
+        verified, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    except PasswordHashingBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ins in progress. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password.")
+
+    if new_hash is not None:
+        await run_in_threadpool(update_user_password_hash, db, user=user, hashed_password=new_hash)
+
     settings = get_settings()
     token = create_access_token(
         subject=user.username,
@@ -1,85 +1,233 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app import crud
-from app.deps import get_current_user, get_db, require_admin
-from app.schemas import ClientCreate, ClientRead, ClientUpdate
+from app import crud, exports, metrics
+from app.core.database import SessionRunner
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.projection import parse_fields
+from app.deps import get_current_user, get_db, get_db_runner, get_read_user, require_admin
+from app.response_cache import cached_list_response, list_etag
+from app.schemas import AuditLogRead, BulkIds, BulkResult, ClientBulkCreate, ClientCreate, ClientRead, ClientUpdate
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 
-@router.get("", response_model=list[ClientRead])
-def list_clients(
+async def _list_clients(
     response: Response,
-    q: str | None = None,
-    include_archived: bool = Query(default=False),
-    page: int | None = Query(default=None, ge=1),
-    page_size: int | None = Query(default=None, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    run: SessionRunner,
+    *,
+    q: str | None,
+    include_archived: bool,
+    page: int | None,
+    page_size: int | None,
+    cursor: str | None,
+    with_total: bool,
+    fields: tuple[str, ...] | None,
 ):
-    if include_archived and current_user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        limit = page_size or 20
+        items, next_id = await run(
+            crud.list_clients_keyset,
+            q=q,
+            include_archived=include_archived,
+            after_id=after_id,
+            limit=limit,
+            fields=fields,
+        )
+        response.headers["X-Page-Size"] = str(limit)
+        if next_id is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+        return items
 
     if page is None and page_size is None:
         if include_archived:
-            return crud.list_clients_including_archived(db, q=q)
-        return crud.list_clients(db, q=q)
+            return await run(crud.list_clients_including_archived, q=q, fields=fields)
+        return await run(crud.list_clients, q=q, fields=fields)
 
     current_page = page or 1
     current_page_size = page_size or 20
     offset = (current_page - 1) * current_page_size
     if include_archived:
-        items, total = crud.list_clients_page_including_archived(db, q=q, offset=offset, limit=current_page_size)
+        items, total = await run(
+            crud.list_clients_page_including_archived,
+            q=q,
+            offset=offset,
+            limit=current_page_size,
+            with_total=with_total,
+            fields=fields,
+        )
     else:
-        items, total = crud.list_clients_page(db, q=q, offset=offset, limit=current_page_size)
+        items, total = await run(
+            crud.list_clients_page,
+            q=q,
+            offset=offset,
+            limit=current_page_size,
+            with_total=with_total,
+            fields=fields,
+        )
 
-    total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
-    response.headers["X-Total-Count"] = str(total)
     response.headers["X-Page"] = str(current_page)
     response.headers["X-Page-Size"] = str(current_page_size)
-    response.headers["X-Total-Pages"] = str(total_pages)
+    if total is not None:
+        total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Pages"] = str(total_pages)
     return items
 
 
+@router.get("", response_model=list[ClientRead])
+async def list_clients(
+    request: Request,
+    response: Response,
+    q: str | None = None,
+    include_archived: bool = Query(default=False),
+    page: int | None = Query(default=None, ge=1),
+    page_size: int | None = Query(default=None, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque value from X-Next-Cursor; send it empty to start cursor pagination.",
+    ),
+    with_total: bool = Query(default=True, description="Set to false to skip counting and omit X-Total-Count."),
+    fields: str | None = Query(default=None, description="Comma-separated fields to return; id is always included."),
+    if_none_match: str | None = Header(default=None),
+    run: SessionRunner = Depends(get_db_runner),
+    current_user=Depends(get_read_user),
+):
+    if include_archived and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+
+    try:
+        projection = parse_fields(fields, crud.CLIENT_LIST_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    version = await run(metrics.change_version, "clients")
+    etag = list_etag(request, collection="clients", version=version, role=current_user.role)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    return await cached_list_response(
+        request,
+        response,
+        collection="clients",
+        version=version,
+        role=current_user.role,
+        compute=lambda: _list_clients(
+            response,
+            run,
+            q=q,
+            include_archived=include_archived,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            with_total=with_total,
+            fields=projection,
+        ),
+    )
+
+
+@router.get("/export")
+def export_clients(
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_archived: bool = Query(default=False),
+    current_user=Depends(get_read_user),
+):
+    if include_archived and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+
+    return StreamingResponse(
+        exports.stream_export(exports.clients_export_stmt(include_archived=include_archived), fmt=fmt),
+        media_type=exports.EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="clients.{fmt}"'},
+    )
+
+
 @router.post("", response_model=ClientRead, status_code=status.HTTP_201_CREATED)
 def create_client(payload: ClientCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    client = crud.create_client(db, data=payload.model_dump())
-    crud.create_audit_log(
-        db,
-        entity_type="client",
-        entity_id=client.id,
-        action="create",
-        actor_user=current_user,
-        summary=f"Created client: {client.name}",
-    )
+    client = crud.create_client(db, data=payload.model_dump(), actor_user=current_user)
     return client
 
 
+@router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_201_CREATED)
+def create_clients_bulk(payload: ClientBulkCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    ids = crud.create_clients(db, rows=[item.model_dump() for item in payload.items], actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/bulk-archive", response_model=BulkResult)
+def archive_clients_bulk(payload: BulkIds, db: Session = Depends(get_db), current_user=Depends(require_admin)):
+    missing = crud.missing_client_ids(db, ids=payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Clients not found: {', '.join(map(str, missing))}.",
+        )
+    ids = crud.archive_clients(db, ids=payload.ids, actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
 @router.get("/{client_id}", response_model=ClientRead)
-def get_client(client_id: int, db: Session = Depends(get_db), _=Depends(get_current_user)):
-    client = crud.get_client(db, client_id=client_id)
+async def get_client(
+    client_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(get_read_user),
+):
+    client = await run(crud.get_client, client_id=client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
+
+    etag = make_etag("client", client.id, client.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return client
 
 
+@router.get("/{client_id}/history", response_model=list[AuditLogRead])
+async def get_client_history(
+    client_id: int,
+    response: Response,
+    page_size: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, description="Opaque value from X-Next-Cursor."),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(require_admin),
+):
+    # History is part of the audit log, so it is admin-only and covers archived clients too.
+    if not await run(crud.get_client_including_archived, client_id=client_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
+
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    items, next_id = await run(
+        crud.entity_history, entity_type="client", entity_id=client_id, after_id=after_id, limit=page_size
+    )
+    response.headers["X-Page-Size"] = str(page_size)
+    if next_id is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+    return items
+
+
 @router.put("/{client_id}", response_model=ClientRead)
 def update_client(client_id: int, payload: ClientUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     client = crud.get_client(db, client_id=client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
-    updated = crud.update_client(db, client=client, data=payload.model_dump())
-    crud.create_audit_log(
-        db,
-        entity_type="client",
-        entity_id=updated.id,
-        action="update",
-        actor_user=current_user,
-        summary=f"Updated client: {updated.name}",
-    )
+    updated = crud.update_client(db, client=client, data=payload.model_dump(), actor_user=current_user)
     return updated
 
 
@@ -88,15 +236,7 @@ def delete_client(client_id: int, db: Session = Depends(get_db), current_user=De
     client = crud.get_client(db, client_id=client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
-    crud.delete_client(db, client=client)
-    crud.create_audit_log(
-        db,
-        entity_type="client",
-        entity_id=client.id,
-        action="archive",
-        actor_user=current_user,
-        summary=f"Archived client: {client.name}",
-    )
+    crud.delete_client(db, client=client, actor_user=current_user)
     return None
 
 
@@ -105,13 +245,5 @@ def restore_client(client_id: int, db: Session = Depends(get_db), current_user=D
     client = crud.get_client_including_archived(db, client_id=client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
-    restored = crud.restore_client(db, client=client)
-    crud.create_audit_log(
-        db,
-        entity_type="client",
-        entity_id=restored.id,
-        action="restore",
-        actor_user=current_user,
-        summary=f"Restored client: {restored.name}",
-    )
+    restored = crud.restore_client(db, client=client, actor_user=current_user)
     return restored
@@ -1,105 +1,302 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app import crud
-from app.deps import get_current_user, get_db, require_admin
-from app.schemas import InvoiceCreate, InvoiceReadWithClient, InvoiceUpdate
+from app import crud, exports, metrics
+from app.core.database import SessionRunner
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.projection import parse_fields
+from app.deps import get_current_user, get_db, get_db_runner, get_read_user, require_admin
+from app.models import InvoiceStatus
+from app.response_cache import cached_list_response, list_etag
+from app.schemas import (
+    AuditLogRead,
+    BulkIds,
+    BulkResult,
+    InvoiceBulkCreate,
+    InvoiceBulkStatus,
+    InvoiceCreate,
+    InvoiceReadWithClient,
+    InvoiceUpdate,
+)
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
 
-@router.get("", response_model=list[InvoiceReadWithClient])
-def list_invoices(
+async def _list_invoices(
     response: Response,
-    include_archived: bool = Query(default=False),
-    page: int | None = Query(default=None, ge=1),
-    page_size: int | None = Query(default=None, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    run: SessionRunner,
+    *,
+    include_archived: bool,
+    page: int | None,
+    page_size: int | None,
+    cursor: str | None,
+    with_total: bool,
+    fields: tuple[str, ...] | None,
+    filters: dict,
+    sort: str,
 ):
-    if include_archived and current_user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        limit = page_size or 20
+        items, next_id = await run(
+            crud.list_invoices_keyset,
+            include_archived=include_archived,
+            after_id=after_id,
+            limit=limit,
+            fields=fields,
+            filters=filters,
+            sort=sort,
+        )
+        response.headers["X-Page-Size"] = str(limit)
+        if next_id is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+        return items
 
     if page is None and page_size is None:
         if include_archived:
-            return crud.list_invoices_including_archived(db)
-        return crud.list_invoices(db)
+            return await run(crud.list_invoices_including_archived, fields=fields, filters=filters, sort=sort)
+        return await run(crud.list_invoices, fields=fields, filters=filters, sort=sort)
 
     current_page = page or 1
     current_page_size = page_size or 20
     offset = (current_page - 1) * current_page_size
     if include_archived:
-        items, total = crud.list_invoices_page_including_archived(db, offset=offset, limit=current_page_size)
+        items, total = await run(
+            crud.list_invoices_page_including_archived,
+            offset=offset,
+            limit=current_page_size,
+            with_total=with_total,
+            fields=fields,
+            filters=filters,
+            sort=sort,
+        )
     else:
-        items, total = crud.list_invoices_page(db, offset=offset, limit=current_page_size)
+        items, total = await run(
+            crud.list_invoices_page,
+            offset=offset,
+            limit=current_page_size,
+            with_total=with_total,
+            fields=fields,
+            filters=filters,
+            sort=sort,
+        )
 
-    total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
-    response.headers["X-Total-Count"] = str(total)
     response.headers["X-Page"] = str(current_page)
     response.headers["X-Page-Size"] = str(current_page_size)
-    response.headers["X-Total-Pages"] = str(total_pages)
+    if total is not None:
+        total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Pages"] = str(total_pages)
     return items
 
 
+@router.get("", response_model=list[InvoiceReadWithClient])
+async def list_invoices(
+    request: Request,
+    response: Response,
+    include_archived: bool = Query(default=False),
+    page: int | None = Query(default=None, ge=1),
+    page_size: int | None = Query(default=None, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque value from X-Next-Cursor; send it empty to start cursor pagination.",
+    ),
+    with_total: bool = Query(default=True, description="Set to false to skip counting and omit X-Total-Count."),
+    fields: str | None = Query(default=None, description="Comma-separated fields to return; id is always included."),
+    status_filter: list[InvoiceStatus] | None = Query(default=None, alias="status"),
+    client_id: int | None = Query(default=None),
+    issued_from: datetime | None = Query(default=None),
+    issued_to: datetime | None = Query(default=None, description="Exclusive upper bound."),
+    amount_min: float | None = Query(default=None, ge=0),
+    amount_max: float | None = Query(default=None, ge=0),
+    sort: str = Query(
+        default="-issued_at",
+        pattern=f"^-?({'|'.join(crud.INVOICE_SORTS)})$",
+        description="Field to sort by; prefix with - for descending order.",
+    ),
+    if_none_match: str | None = Header(default=None),
+    run: SessionRunner = Depends(get_db_runner),
+    current_user=Depends(get_read_user),
+):
+    if include_archived and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+
+    try:
+        projection = parse_fields(fields, crud.INVOICE_LIST_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    filters = {
+        "status": status_filter,
+        "client_id": client_id,
+        "issued_from": issued_from,
+        "issued_to": issued_to,
+        "amount_min": amount_min,
+        "amount_max": amount_max,
+    }
+
+    version = await run(metrics.change_version, "invoices")
+    etag = list_etag(request, collection="invoices", version=version, role=current_user.role)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    return await cached_list_response(
+        request,
+        response,
+        collection="invoices",
+        version=version,
+        role=current_user.role,
+        compute=lambda: _list_invoices(
+            response,
+            run,
+            include_archived=include_archived,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            with_total=with_total,
+            fields=projection,
+            filters=filters,
+            sort=sort,
+        ),
+    )
+
+
+@router.get("/export")
+def export_invoices(
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_archived: bool = Query(default=False),
+    current_user=Depends(get_read_user),
+):
+    if include_archived and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+
+    return StreamingResponse(
+        exports.stream_export(exports.invoices_export_stmt(include_archived=include_archived), fmt=fmt),
+        media_type=exports.EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="invoices.{fmt}"'},
+    )
+
+
 @router.post("", response_model=InvoiceReadWithClient, status_code=status.HTTP_201_CREATED)
 def create_invoice(payload: InvoiceCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     client = crud.get_client(db, client_id=payload.client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
-    invoice = crud.create_invoice(db, data=payload.model_dump())
-    hydrated = crud.get_invoice(db, invoice_id=invoice.id)
-    result = hydrated or invoice
-    crud.create_audit_log(
-        db,
-        entity_type="invoice",
-        entity_id=result.id,
-        action="create",
-        actor_user=current_user,
-        summary=f"Created invoice: {result.title}",
-    )
-    return result
+    invoice = crud.create_invoice(db, client=client, data=payload.model_dump(), actor_user=current_user)
+    return invoice
+
+
+@router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_201_CREATED)
+def create_invoices_bulk(payload: InvoiceBulkCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    missing = crud.missing_client_ids(db, ids=[item.client_id for item in payload.items])
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Clients not found: {', '.join(map(str, missing))}.",
+        )
+    ids = crud.create_invoices(db, rows=[item.model_dump() for item in payload.items], actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.patch("/bulk-status", response_model=BulkResult)
+def update_invoices_status_bulk(
+    payload: InvoiceBulkStatus, db: Session = Depends(get_db), current_user=Depends(get_current_user)
+):
+    missing = crud.missing_invoice_ids(db, ids=payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Invoices not found: {', '.join(map(str, missing))}.",
+        )
+    ids = crud.update_invoices_status(db, ids=payload.ids, status=payload.status, actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/bulk-archive", response_model=BulkResult)
+def archive_invoices_bulk(payload: BulkIds, db: Session = Depends(get_db), current_user=Depends(require_admin)):
+    missing = crud.missing_invoice_ids(db, ids=payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Invoices not found: {', '.join(map(str, missing))}.",
+        )
+    ids = crud.archive_invoices(db, ids=payload.ids, actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
 
 
 @router.get("/{invoice_id}", response_model=InvoiceReadWithClient)
-def get_invoice(invoice_id: int, db: Session = Depends(get_db), _=Depends(get_current_user)):
-    invoice = crud.get_invoice(db, invoice_id=invoice_id)
+async def get_invoice(
+    invoice_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(get_read_user),
+):
+    invoice = await run(crud.get_invoice, invoice_id=invoice_id)
     if not invoice:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found.")
+
+    etag = make_etag("invoice", invoice.id, invoice.version, invoice.client.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return invoice
 
 
+@router.get("/{invoice_id}/history", response_model=list[AuditLogRead])
+async def get_invoice_history(
+    invoice_id: int,
+    response: Response,
+    page_size: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, description="Opaque value from X-Next-Cursor."),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(require_admin),
+):
+    # History is part of the audit log, so it is admin-only and covers archived invoices too.
+    if not await run(crud.get_invoice_including_archived, invoice_id=invoice_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found.")
+
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    items, next_id = await run(
+        crud.entity_history, entity_type="invoice", entity_id=invoice_id, after_id=after_id, limit=page_size
+    )
+    response.headers["X-Page-Size"] = str(page_size)
+    if next_id is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+    return items
+
+
 @router.put("/{invoice_id}", response_model=InvoiceReadWithClient)
 def update_invoice(invoice_id: int, payload: InvoiceUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     invoice = crud.get_invoice(db, invoice_id=invoice_id)
     if not invoice:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found.")
 
-    prev_status = invoice.status
-
-    client = crud.get_client(db, client_id=payload.client_id)
+    client = invoice.client
+    if client.id != payload.client_id:
+        client = crud.get_client(db, client_id=payload.client_id)
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found.")
 
-    updated = crud.update_invoice(db, invoice=invoice, data=payload.model_dump())
-    hydrated = crud.get_invoice(db, invoice_id=updated.id)
-    result = hydrated or updated
-    action = "status_change" if payload.status != prev_status else "update"
-    summary = (
-        f"Invoice status: {result.title} {prev_status.value} → {result.status.value}"
-        if action == "status_change"
-        else f"Updated invoice: {result.title}"
+    updated = crud.update_invoice(
+        db, invoice=invoice, client=client, data=payload.model_dump(), actor_user=current_user
     )
-    crud.create_audit_log(
-        db,
-        entity_type="invoice",
-        entity_id=result.id,
-        action=action,
-        actor_user=current_user,
-        summary=summary,
-    )
-    return result
+    return updated
 
 
 @router.delete("/{invoice_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -107,15 +304,7 @@ def delete_invoice(invoice_id: int, db: Session = Depends(get_db), current_user=
     invoice = crud.get_invoice(db, invoice_id=invoice_id)
     if not invoice:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found.")
-    crud.delete_invoice(db, invoice=invoice)
-    crud.create_audit_log(
-        db,
-        entity_type="invoice",
-        entity_id=invoice.id,
-        action="archive",
-        actor_user=current_user,
-        summary=f"Archived invoice: {invoice.title}",
-    )
+    crud.delete_invoice(db, invoice=invoice, actor_user=current_user)
     return None
 
 
@@ -124,15 +313,5 @@ def restore_invoice(invoice_id: int, db: Session = Depends(get_db), current_user
     invoice = crud.get_invoice_including_archived(db, invoice_id=invoice_id)
     if not invoice:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found.")
-    restored = crud.restore_invoice(db, invoice=invoice)
-    hydrated = crud.get_invoice_including_archived(db, invoice_id=restored.id)
-    result = hydrated or restored
-    crud.create_audit_log(
-        db,
-        entity_type="invoice",
-        entity_id=result.id,
-        action="restore",
-        actor_user=current_user,
-        summary=f"Restored invoice: {result.title}",
-    )
-    return result
+    restored = crud.restore_invoice(db, invoice=invoice, actor_user=current_user)
+    return restored
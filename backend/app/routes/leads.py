@@ -1,91 +1,279 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app import crud
-from app.deps import get_current_user, get_db, require_admin
-from app.schemas import LeadCreate, LeadRead, LeadUpdate
+from app import crud, exports, metrics
+from app.core.database import SessionRunner
+from app.core.etag import etag_matches, make_etag, not_modified
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.projection import parse_fields
+from app.deps import get_current_user, get_db, get_db_runner, get_read_user, require_admin
+from app.models import LeadStatus
+from app.response_cache import cached_list_response, list_etag
+from app.schemas import (
+    AuditLogRead,
+    BulkIds,
+    BulkResult,
+    LeadBulkCreate,
+    LeadBulkStatus,
+    LeadCreate,
+    LeadRead,
+    LeadUpdate,
+)
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 
 
-@router.get("", response_model=list[LeadRead])
-def list_leads(
+async def _list_leads(
     response: Response,
-    include_archived: bool = Query(default=False),
-    page: int | None = Query(default=None, ge=1),
-    page_size: int | None = Query(default=None, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    run: SessionRunner,
+    *,
+    include_archived: bool,
+    page: int | None,
+    page_size: int | None,
+    cursor: str | None,
+    with_total: bool,
+    fields: tuple[str, ...] | None,
+    filters: dict,
+    sort: str,
 ):
-    if include_archived and current_user.role != "admin":
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+        limit = page_size or 20
+        items, next_id = await run(
+            crud.list_leads_keyset,
+            include_archived=include_archived,
+            after_id=after_id,
+            limit=limit,
+            fields=fields,
+            filters=filters,
+            sort=sort,
+        )
+        response.headers["X-Page-Size"] = str(limit)
+        if next_id is not None:
+            response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+        return items
 
     if page is None and page_size is None:
         if include_archived:
-            return crud.list_leads_including_archived(db)
-        return crud.list_leads(db)
+            return await run(crud.list_leads_including_archived, fields=fields, filters=filters, sort=sort)
+        return await run(crud.list_leads, fields=fields, filters=filters, sort=sort)
 
     current_page = page or 1
     current_page_size = page_size or 20
     offset = (current_page - 1) * current_page_size
     if include_archived:
-        items, total = crud.list_leads_page_including_archived(db, offset=offset, limit=current_page_size)
+        items, total = await run(
+            crud.list_leads_page_including_archived,
+            offset=offset,
+            limit=current_page_size,
+            with_total=with_total,
+            fields=fields,
+            filters=filters,
+            sort=sort,
+        )
     else:
-        items, total = crud.list_leads_page(db, offset=offset, limit=current_page_size)
+        items, total = await run(
+            crud.list_leads_page,
+            offset=offset,
+            limit=current_page_size,
+            with_total=with_total,
+            fields=fields,
+            filters=filters,
+            sort=sort,
+        )
 
-    total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
-    response.headers["X-Total-Count"] = str(total)
     response.headers["X-Page"] = str(current_page)
     response.headers["X-Page-Size"] = str(current_page_size)
-    response.headers["X-Total-Pages"] = str(total_pages)
+    if total is not None:
+        total_pages = (total + current_page_size - 1) // current_page_size if current_page_size else 0
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Pages"] = str(total_pages)
     return items
 
 
+@router.get("", response_model=list[LeadRead])
+async def list_leads(
+    request: Request,
+    response: Response,
+    include_archived: bool = Query(default=False),
+    page: int | None = Query(default=None, ge=1),
+    page_size: int | None = Query(default=None, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque value from X-Next-Cursor; send it empty to start cursor pagination.",
+    ),
+    with_total: bool = Query(default=True, description="Set to false to skip counting and omit X-Total-Count."),
+    fields: str | None = Query(default=None, description="Comma-separated fields to return; id is always included."),
+    status_filter: list[LeadStatus] | None = Query(default=None, alias="status"),
+    source: str | None = Query(default=None),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None, description="Exclusive upper bound."),
+    sort: str = Query(
+        default="-created_at",
+        pattern=f"^-?({'|'.join(crud.LEAD_SORTS)})$",
+        description="Field to sort by; prefix with - for descending order.",
+    ),
+    if_none_match: str | None = Header(default=None),
+    run: SessionRunner = Depends(get_db_runner),
+    current_user=Depends(get_read_user),
+):
+    if include_archived and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+
+    try:
+        projection = parse_fields(fields, crud.LEAD_LIST_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    filters = {
+        "status": status_filter,
+        "source": source,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+
+    version = await run(metrics.change_version, "leads")
+    etag = list_etag(request, collection="leads", version=version, role=current_user.role)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    return await cached_list_response(
+        request,
+        response,
+        collection="leads",
+        version=version,
+        role=current_user.role,
+        compute=lambda: _list_leads(
+            response,
+            run,
+            include_archived=include_archived,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            with_total=with_total,
+            fields=projection,
+            filters=filters,
+            sort=sort,
+        ),
+    )
+
+
+@router.get("/export")
+def export_leads(
+    fmt: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_archived: bool = Query(default=False),
+    current_user=Depends(get_read_user),
+):
+    if include_archived and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges are required for this action.")
+
+    return StreamingResponse(
+        exports.stream_export(exports.leads_export_stmt(include_archived=include_archived), fmt=fmt),
+        media_type=exports.EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="leads.{fmt}"'},
+    )
+
+
 @router.post("", response_model=LeadRead, status_code=status.HTTP_201_CREATED)
 def create_lead(payload: LeadCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    lead = crud.create_lead(db, data=payload.model_dump())
-    crud.create_audit_log(
-        db,
-        entity_type="lead",
-        entity_id=lead.id,
-        action="create",
-        actor_user=current_user,
-        summary=f"Created lead: {lead.name}",
-    )
+    lead = crud.create_lead(db, data=payload.model_dump(), actor_user=current_user)
     return lead
 
 
+@router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_201_CREATED)
+def create_leads_bulk(payload: LeadBulkCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    ids = crud.create_leads(db, rows=[item.model_dump() for item in payload.items], actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.patch("/bulk-status", response_model=BulkResult)
+def update_leads_status_bulk(
+    payload: LeadBulkStatus, db: Session = Depends(get_db), current_user=Depends(get_current_user)
+):
+    missing = crud.missing_lead_ids(db, ids=payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Leads not found: {', '.join(map(str, missing))}.",
+        )
+    ids = crud.update_leads_status(db, ids=payload.ids, status=payload.status, actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
+@router.post("/bulk-archive", response_model=BulkResult)
+def archive_leads_bulk(payload: BulkIds, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    missing = crud.missing_lead_ids(db, ids=payload.ids)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Leads not found: {', '.join(map(str, missing))}.",
+        )
+    ids = crud.archive_leads(db, ids=payload.ids, actor_user=current_user)
+    return BulkResult(count=len(ids), ids=ids)
+
+
 @router.get("/{lead_id}", response_model=LeadRead)
-def get_lead(lead_id: int, db: Session = Depends(get_db), _=Depends(get_current_user)):
-    lead = crud.get_lead(db, lead_id=lead_id)
+async def get_lead(
+    lead_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(get_read_user),
+):
+    lead = await run(crud.get_lead, lead_id=lead_id)
     if not lead:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found.")
+
+    etag = make_etag("lead", lead.id, lead.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return lead
 
 
+@router.get("/{lead_id}/history", response_model=list[AuditLogRead])
+async def get_lead_history(
+    lead_id: int,
+    response: Response,
+    page_size: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, description="Opaque value from X-Next-Cursor."),
+    run: SessionRunner = Depends(get_db_runner),
+    _=Depends(require_admin),
+):
+    # History is part of the audit log, so it is admin-only and covers archived leads too.
+    if not await run(crud.get_lead_including_archived, lead_id=lead_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found.")
+
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    items, next_id = await run(
+        crud.entity_history, entity_type="lead", entity_id=lead_id, after_id=after_id, limit=page_size
+    )
+    response.headers["X-Page-Size"] = str(page_size)
+    if next_id is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_id)
+    return items
+
+
 @router.put("/{lead_id}", response_model=LeadRead)
 def update_lead(lead_id: int, payload: LeadUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     lead = crud.get_lead(db, lead_id=lead_id)
     if not lead:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found.")
-    prev_status = lead.status
-    updated = crud.update_lead(db, lead=lead, data=payload.model_dump())
-    action = "status_change" if payload.status != prev_status else "update"
-    summary = (
-        f"Lead status: {updated.name} {prev_status.value} → {updated.status.value}"
-        if action == "status_change"
-        else f"Updated lead: {updated.name}"
-    )
-    crud.create_audit_log(
-        db,
-        entity_type="lead",
-        entity_id=updated.id,
-        action=action,
-        actor_user=current_user,
-        summary=summary,
-    )
+    updated = crud.update_lead(db, lead=lead, data=payload.model_dump(), actor_user=current_user)
     return updated
 
 
@@ -94,15 +282,7 @@ def delete_lead(lead_id: int, db: Session = Depends(get_db), current_user=Depend
     lead = crud.get_lead(db, lead_id=lead_id)
     if not lead:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found.")
-    crud.delete_lead(db, lead=lead)
-    crud.create_audit_log(
-        db,
-        entity_type="lead",
-        entity_id=lead.id,
-        action="archive",
-        actor_user=current_user,
-        summary=f"Archived lead: {lead.name}",
-    )
+    crud.delete_lead(db, lead=lead, actor_user=current_user)
     return None
 
 
@@ -111,13 +291,5 @@ def restore_lead(lead_id: int, db: Session = Depends(get_db), current_user=Depen
     lead = crud.get_lead_including_archived(db, lead_id=lead_id)
     if not lead:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found.")
-    restored = crud.restore_lead(db, lead=lead)
-    crud.create_audit_log(
-        db,
-        entity_type="lead",
-        entity_id=restored.id,
-        action="restore",
-        actor_user=current_user,
-        summary=f"Restored lead: {restored.name}",
-    )
+    restored = crud.restore_lead(db, lead=lead, actor_user=current_user)
     return restored
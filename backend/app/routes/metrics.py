@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Request
+
+from app import metrics
+from app.core.database import SessionRunner, async_engine, engine, pool_stats
+from app.core.security import password_hasher
+from app.deps import get_db_runner, get_read_user, require_admin
+from app.schemas import MetricsSummary, RuntimeMetrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/summary", response_model=MetricsSummary)
+async def get_summary(run: SessionRunner = Depends(get_db_runner), _=Depends(get_read_user)):
+    return await run(metrics.read_summary)
+
+
+@router.get("/runtime", response_model=RuntimeMetrics)
+def get_runtime(request: Request, _=Depends(require_admin)):
+    return {
+        "startup_ms": getattr(request.app.state, "startup_timings_ms", {}),
+        "password_hashing": password_hasher.stats(),
+        "database_pool": pool_stats(engine),
+        "async_database_pool": pool_stats(async_engine.sync_engine) if async_engine is not None else None,
+    }
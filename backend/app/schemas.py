@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -12,6 +13,10 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+# Upper bound on items per bulk request; larger imports are sent in several requests.
+BULK_MAX_ITEMS = 5000
+
+
 class UserPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -96,6 +101,40 @@ class InvoiceReadWithClient(InvoiceRead):
     client: ClientRead
 
 
+class BulkIds(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class ClientBulkCreate(BaseModel):
+    items: list[ClientCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class LeadBulkCreate(BaseModel):
+    items: list[LeadCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class LeadBulkStatus(BulkIds):
+    status: LeadStatus
+
+
+class InvoiceBulkCreate(BaseModel):
+    items: list[InvoiceCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class InvoiceBulkStatus(BulkIds):
+    status: InvoiceStatus
+
+
+class BulkResult(BaseModel):
+    count: int
+    ids: list[int]
+
+
+class FieldChange(BaseModel):
+    before: Any = None
+    after: Any = None
+
+
 class AuditLogRead(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
@@ -107,3 +146,98 @@ class AuditLogRead(BaseModel):
     actor_role: str
     timestamp: datetime = Field(alias="created_at")
     summary: str | None = None
+    changes: dict[str, FieldChange] | None = None
+
+
+class InvoiceStatusTotals(BaseModel):
+    count: int
+    amount: float
+
+
+class MetricsSummary(BaseModel):
+    total_clients: int
+    active_leads: int
+    leads_by_status: dict[LeadStatus, int]
+    invoices_by_status: dict[InvoiceStatus, InvoiceStatusTotals]
+    monthly_revenue: float
+
+
+RevenueBucket = Literal["day", "week", "month"]
+
+
+class RevenuePeriod(BaseModel):
+    start: date
+    totals: dict[InvoiceStatus, InvoiceStatusTotals]
+
+
+class ClientRevenue(BaseModel):
+    client_id: int
+    client_name: str | None = None
+    totals: dict[InvoiceStatus, InvoiceStatusTotals]
+
+
+class RevenueReport(BaseModel):
+    bucket: RevenueBucket
+    start: date
+    end: date
+    periods: list[RevenuePeriod]
+    clients: list[ClientRevenue]
+
+
+class StageDurations(BaseModel):
+    samples: int
+    p50_seconds: float | None = None
+    p75_seconds: float | None = None
+    p90_seconds: float | None = None
+
+
+class LeadFunnelStage(BaseModel):
+    status: LeadStatus
+    current: int
+    entered: int
+    exited: int
+    advanced: int
+    lost: int
+    conversion_rate: float | None = None
+    time_in_stage: StageDurations | None = None
+
+
+class LeadTransitionCount(BaseModel):
+    from_status: LeadStatus
+    to_status: LeadStatus
+    count: int
+
+
+class LeadFunnelReport(BaseModel):
+    start: date
+    end: date
+    created: int
+    stages: list[LeadFunnelStage]
+    transitions: list[LeadTransitionCount]
+
+
+class PasswordHashingStats(BaseModel):
+    workers: int
+    max_pending: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
+    rehashed: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class DatabasePoolStats(BaseModel):
+    pool_class: str
+    size: int | None = None
+    checkedin: int | None = None
+    checkedout: int | None = None
+    overflow: int | None = None
+
+
+class RuntimeMetrics(BaseModel):
+    startup_ms: dict[str, float] = Field(default_factory=dict)
+    password_hashing: PasswordHashingStats
+    database_pool: DatabasePoolStats
+    async_database_pool: DatabasePoolStats | None = None
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import Protocol
+
+from sqlalchemy import Connection, Engine, Select, bindparam, column, literal_column, or_, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import engine
+from app.models import Client
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class ClientSearch(Protocol):
+    """Keeps a client search index in sync and applies it to list queries."""
+
+    def setup(self, conn: Connection) -> None: ...
+
+    def sync_client(self, db: Session, client: Client) -> None: ...
+
+    def sync_clients(self, db: Session, rows: list[dict]) -> None: ...
+
+    def apply(self, stmt: Select, q: str, *, ranked: bool) -> Select: ...
+
+
+def _like_condition(q: str):
+    like = f"%{q.strip()}%"
+    return or_(
+        Client.name.ilike(like),
+        Client.company.ilike(like),
+        Client.email.ilike(like),
+        Client.notes.ilike(like),
+    )
+
+
+class LikeClientSearch:
+    """Portable fallback: substring matching with no index and no ranking."""
+
+    def setup(self, conn: Connection) -> None:
+        return None
+
+    def sync_client(self, db: Session, client: Client) -> None:
+        return None
+
+    def sync_clients(self, db: Session, rows: list[dict]) -> None:
+        return None
+
+    def apply(self, stmt: Select, q: str, *, ranked: bool) -> Select:
+        return stmt.where(_like_condition(q))
+
+
+class SqliteFtsClientSearch:
+    """SQLite FTS5 index over name, company, email and notes, keyed by client id.
+
+    Archived clients stay indexed so admin searches with include_archived still
+    match them; the deleted_at filter is applied by the caller as usual.
+    """
+
+    table_name = "clients_fts"
+
+    def __init__(self) -> None:
+        self._fts = table(self.table_name, column("rowid"), column("rank"))
+
+    def setup(self, conn: Connection) -> None:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": self.table_name},
+        ).first()
+        if exists:
+            return
+
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {self.table_name} USING fts5("
+                "name, company, email, notes, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        )
+        # Persist the column weights so `rank` orders name hits above notes hits.
+        conn.execute(
+            text(f"INSERT INTO {self.table_name} ({self.table_name}, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 1.0)')")
+        )
+        conn.execute(
+            text(
+                f"INSERT INTO {self.table_name} (rowid, name, company, email, notes) "
+                "SELECT id, name, company, email, notes FROM clients"
+            )
+        )
+
+    def sync_client(self, db: Session, client: Client) -> None:
+        if client.id is None:
+            db.flush()
+        db.execute(text(f"DELETE FROM {self.table_name} WHERE rowid = :id"), {"id": client.id})
+        db.execute(
+            text(
+                f"INSERT INTO {self.table_name} (rowid, name, company, email, notes) "
+                "VALUES (:id, :name, :company, :email, :notes)"
+            ),
+            {
+                "id": client.id,
+                "name": client.name,
+                "company": client.company,
+                "email": client.email,
+                "notes": client.notes,
+            },
+        )
+
+    def sync_clients(self, db: Session, rows: list[dict]) -> None:
+        """Index many clients at once; each row needs id, name, company, email and notes."""
+        if not rows:
+            return
+        params = [
+            {
+                "id": row["id"],
+                "name": row.get("name"),
+                "company": row.get("company"),
+                "email": row.get("email"),
+                "notes": row.get("notes"),
+            }
+            for row in rows
+        ]
+        db.execute(text(f"DELETE FROM {self.table_name} WHERE rowid = :id"), [{"id": p["id"]} for p in params])
+        db.execute(
+            text(
+                f"INSERT INTO {self.table_name} (rowid, name, company, email, notes) "
+                "VALUES (:id, :name, :company, :email, :notes)"
+            ),
+            params,
+        )
+
+    def apply(self, stmt: Select, q: str, *, ranked: bool) -> Select:
+        tokens = _TOKEN_RE.findall(q)
+        if not tokens:
+            return stmt.where(_like_condition(q))
+
+        # Every token must match, each as a prefix, so typeahead input works.
+        match_expr = " ".join(f'"{token}"*' for token in tokens)
+        stmt = stmt.join(self._fts, self._fts.c.rowid == Client.id).where(
+            literal_column(self.table_name).op("MATCH")(bindparam("client_search_q", match_expr))
+        )
+        if ranked:
+            stmt = stmt.order_by(self._fts.c.rank)
+        return stmt
+
+
+def _fts5_available(engine: Engine) -> bool:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)"))
+            conn.execute(text("DROP TABLE temp._fts5_probe"))
+        return True
+    except OperationalError:
+        return False
+
+
+@lru_cache
+def get_client_search() -> ClientSearch:
+    backend = get_settings().client_search_backend
+    if backend == "auto":
+        backend = "fts5" if engine.dialect.name == "sqlite" and _fts5_available(engine) else "like"
+
+    if backend == "fts5":
+        return SqliteFtsClientSearch()
+    if backend == "like":
+        return LikeClientSearch()
+
+    logger.warning("Unknown client_search_backend %r; falling back to LIKE search.", backend)
+    return LikeClientSearch()
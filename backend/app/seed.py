@@ -41,6 +41,7 @@ def seed_if_empty(db: Session) -> None:
 
         create_invoice(
             db,
+            client=acme,
             data={
                 "client_id": acme.id,
                 "title": "Operations Retainer - January",
@@ -50,6 +51,7 @@ def seed_if_empty(db: Session) -> None:
         )
         create_invoice(
             db,
+            client=northwind,
             data={
                 "client_id": northwind.id,
                 "title": "Lead Gen Campaign Setup",
@@ -91,6 +93,7 @@ def seed_if_empty(db: Session) -> None:
         if first_client:
             create_invoice(
                 db,
+                client=first_client,
                 data={
                     "client_id": first_client.id,
                     "title": "Initial Setup",
@@ -11,13 +11,23 @@ export interface AuditLog {
   actor_role: string;
   timestamp: string;
   summary?: string | null;
+  changes?: Record<string, { before: unknown; after: unknown }> | null;
 }
 
-export async function listAuditLogsPage(params: { page: number; pageSize: number }): Promise<PageResult<AuditLog>> {
+export async function listAuditLogsPage(params: {
+  page: number;
+  pageSize: number;
+  entityType?: string;
+  action?: string;
+  archived?: boolean;
+}): Promise<PageResult<AuditLog>> {
   const resp = await api.get<AuditLog[]>("/api/audit-logs", {
     params: {
       page: params.page,
-      page_size: params.pageSize
+      page_size: params.pageSize,
+      entity_type: params.entityType || undefined,
+      action: params.action || undefined,
+      archived: params.archived ? true : undefined
     }
   });
 
@@ -28,3 +38,14 @@ export async function listAuditLogsPage(params: { page: number; pageSize: number
 
   return { items: resp.data, total, page, pageSize, totalPages };
 }
+
+export async function getEntityHistory(
+  collection: "clients" | "leads" | "invoices",
+  id: number,
+  params: { pageSize?: number; cursor?: string } = {}
+): Promise<{ items: AuditLog[]; nextCursor: string | null }> {
+  const resp = await api.get<AuditLog[]>(`/api/${collection}/${id}/history`, {
+    params: { page_size: params.pageSize, cursor: params.cursor }
+  });
+  return { items: resp.data, nextCursor: resp.headers["x-next-cursor"] ?? null };
+}
@@ -9,8 +9,11 @@ export interface PageResult<T> {
   totalPages: number;
 }
 
-export async function listClients(q?: string): Promise<Client[]> {
-  const resp = await api.get<Client[]>("/api/clients", { params: q ? { q } : undefined });
+// Columns shown in client tables; notes are loaded with the full record when editing.
+const CLIENT_TABLE_FIELDS = "name,email,phone,company,created_at,deleted_at";
+
+export async function listClients(q?: string, fields?: string): Promise<Client[]> {
+  const resp = await api.get<Client[]>("/api/clients", { params: { q: q || undefined, fields } });
   return resp.data;
 }
 
@@ -25,7 +28,8 @@ export async function listClientsPage(params: {
       q: params.q,
       page: params.page,
       page_size: params.pageSize,
-      include_archived: params.includeArchived ? true : undefined
+      include_archived: params.includeArchived ? true : undefined,
+      fields: CLIENT_TABLE_FIELDS
     }
   });
 
@@ -37,6 +41,11 @@ export async function listClientsPage(params: {
   return { items: resp.data, total, page, pageSize, totalPages };
 }
 
+export async function getClient(id: number): Promise<Client> {
+  const resp = await api.get<Client>(`/api/clients/${id}`);
+  return resp.data;
+}
+
 export async function createClient(payload: Omit<Client, "id" | "created_at">): Promise<Client> {
   const resp = await api.post<Client>("/api/clients", payload);
   return resp.data;
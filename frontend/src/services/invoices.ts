@@ -1,8 +1,11 @@
 import { api } from "@/services/api";
-import type { Invoice } from "@/types";
+import type { Invoice, InvoiceStatus } from "@/types";
 
 import type { PageResult } from "@/services/clients";
 
+// Invoice tables only show the client's name and company.
+const INVOICE_TABLE_FIELDS = "client_id,title,amount,status,issued_at,paid_at,deleted_at,client.name,client.company";
+
 export async function listInvoices(): Promise<Invoice[]> {
   const resp = await api.get<Invoice[]>("/api/invoices");
   return resp.data;
@@ -12,12 +15,19 @@ export async function listInvoicesPage(params: {
   page: number;
   pageSize: number;
   includeArchived?: boolean;
+  status?: InvoiceStatus;
+  clientId?: number;
+  sort?: string;
 }): Promise<PageResult<Invoice>> {
   const resp = await api.get<Invoice[]>("/api/invoices", {
     params: {
       page: params.page,
       page_size: params.pageSize,
-      include_archived: params.includeArchived ? true : undefined
+      include_archived: params.includeArchived ? true : undefined,
+      status: params.status,
+      client_id: params.clientId,
+      sort: params.sort,
+      fields: INVOICE_TABLE_FIELDS
     }
   });
 
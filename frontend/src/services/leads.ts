@@ -1,8 +1,11 @@
 import { api } from "@/services/api";
-import type { Lead } from "@/types";
+import type { Lead, LeadStatus } from "@/types";
 
 import type { PageResult } from "@/services/clients";
 
+// Fields shown on lead cards; notes are loaded with the full record when editing.
+const LEAD_CARD_FIELDS = "name,email,source,status,created_at,deleted_at";
+
 export async function listLeads(): Promise<Lead[]> {
   const resp = await api.get<Lead[]>("/api/leads");
   return resp.data;
@@ -12,12 +15,19 @@ export async function listLeadsPage(params: {
   page: number;
   pageSize: number;
   includeArchived?: boolean;
+  status?: LeadStatus;
+  source?: string;
+  sort?: string;
 }): Promise<PageResult<Lead>> {
   const resp = await api.get<Lead[]>("/api/leads", {
     params: {
       page: params.page,
       page_size: params.pageSize,
-      include_archived: params.includeArchived ? true : undefined
+      include_archived: params.includeArchived ? true : undefined,
+      status: params.status,
+      source: params.source || undefined,
+      sort: params.sort,
+      fields: LEAD_CARD_FIELDS
     }
   });
 
@@ -29,6 +39,11 @@ export async function listLeadsPage(params: {
   return { items: resp.data, total, page, pageSize, totalPages };
 }
 
+export async function getLead(id: number): Promise<Lead> {
+  const resp = await api.get<Lead>(`/api/leads/${id}`);
+  return resp.data;
+}
+
 export async function createLead(payload: Omit<Lead, "id" | "created_at">): Promise<Lead> {
   const resp = await api.post<Lead>("/api/leads", payload);
   return resp.data;
@@ -39,6 +54,10 @@ export async function updateLead(id: number, payload: Omit<Lead, "id" | "created
   return resp.data;
 }
 
+export async function updateLeadStatus(id: number, status: LeadStatus): Promise<void> {
+  await api.patch("/api/leads/bulk-status", { ids: [id], status });
+}
+
 export async function deleteLead(id: number): Promise<void> {
   await api.delete(`/api/leads/${id}`);
 }
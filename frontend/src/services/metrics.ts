@@ -0,0 +1,7 @@
+import { api } from "@/services/api";
+import type { MetricsSummary } from "@/types";
+
+export async function getMetricsSummary(): Promise<MetricsSummary> {
+  const resp = await api.get<MetricsSummary>("/api/metrics/summary");
+  return resp.data;
+}
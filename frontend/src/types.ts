@@ -43,3 +43,16 @@ export interface Invoice {
   client: Client;
   deleted_at?: string | null;
 }
+
+export interface InvoiceStatusTotals {
+  count: number;
+  amount: number;
+}
+
+export interface MetricsSummary {
+  total_clients: number;
+  active_leads: number;
+  leads_by_status: Record<LeadStatus, number>;
+  invoices_by_status: Record<InvoiceStatus, InvoiceStatusTotals>;
+  monthly_revenue: number;
+}